@@ -4,10 +4,46 @@ Common utilities for action modules
 """
 
 import logging
+import re
+from functools import lru_cache
 import google.generativeai as genai
 
 logger = logging.getLogger(__name__)
 
+# Common replies that can be classified without a model call
+_CONFIRM_WORDS = frozenset({"yes", "yeah", "yep", "sure", "ok", "okay", "confirm", "do it", "go ahead", "please"})
+_DENY_WORDS = frozenset({"no", "nope", "nah", "deny", "don't", "do not"})
+_CANCEL_WORDS = frozenset({"cancel", "stop", "abort", "nevermind", "never mind", "quit"})
+# Any of these can flip the meaning of a confirm word ("not ok"), so such replies go to Gemini
+_NEGATION_WORDS = frozenset({"not", "never", "cannot", "nothing"})
+
+def _mentions(text: str, phrases) -> bool:
+    """Whether any entry appears in the text as whole words (multi-word entries as phrases)"""
+    padded = f" {text} "
+    return any(f" {phrase} " in padded for phrase in phrases)
+
+def _match_local_intent(response: str):
+    """Classify an obvious yes/no/cancel reply locally, or return None if ambiguous"""
+    text = " ".join(re.sub(r"[^\w\s']", " ", response.lower()).split())
+    if text in _CONFIRM_WORDS:
+        return "confirm"
+    if text in _DENY_WORDS:
+        return "deny"
+    if text in _CANCEL_WORDS:
+        return "cancel"
+    
+    tokens = text.split()
+    if any(t in _NEGATION_WORDS or t.endswith("n't") for t in tokens):
+        return None
+    hits = set()
+    if _mentions(text, _CONFIRM_WORDS):
+        hits.add("confirm")
+    if _mentions(text, _DENY_WORDS):
+        hits.add("deny")
+    if _mentions(text, _CANCEL_WORDS):
+        hits.add("cancel")
+    return hits.pop() if len(hits) == 1 else None
+
 def get_confirmation(user_response: str, context_question: str) -> str:
     """
     Get confirmation intent from user response.
@@ -23,22 +59,14 @@ def get_confirmation(user_response: str, context_question: str) -> str:
         logger.warning("Empty user response for confirmation")
         return "deny"
     
+    intent = _match_local_intent(user_response)
+    if intent:
+        logger.info(f"Confirmation intent (local): {intent}")
+        return intent
+    
     try:
         logger.debug(f"Getting confirmation for: '{user_response}' (context: '{context_question}')")
-        
-        model = genai.GenerativeModel('gemini-2.0-flash')
-        prompt = (
-            f"User was asked: '{context_question}'\n"
-            f"User replied: '{user_response}'\n"
-            f"Analyze the user's intent. Respond with exactly one word:\n"
-            f"- 'confirm' if they agree/accept/yes\n"
-            f"- 'deny' if they disagree/decline/no\n"
-            f"- 'cancel' if they want to cancel/stop\n"
-            f"If unclear, default to 'deny'."
-        )
-        
-        response = model.generate_content(prompt)
-        intent = response.text.strip().lower()
+        intent = _ask_gemini_intent(user_response.strip(), context_question)
         
         # Validate response
         valid_intents = ['confirm', 'deny', 'cancel']
@@ -51,4 +79,54 @@ def get_confirmation(user_response: str, context_question: str) -> str:
             
     except Exception as e:
         logger.error(f"Gemini confirmation error: {e}")
-        return "deny"
\ No newline at end of file
+        return "deny"
+
+_CONFIRM_SYSTEM_INSTRUCTION = (
+    "You classify a user's spoken reply to a yes/no question. "
+    "Respond with exactly one word:\n"
+    "- 'confirm' if they agree/accept/yes\n"
+    "- 'deny' if they disagree/decline/no\n"
+    "- 'cancel' if they want to cancel/stop\n"
+    "If unclear, default to 'deny'."
+)
+_CONFIRM_GENERATION_CONFIG = {"max_output_tokens": 2, "temperature": 0}
+_confirm_model = None
+
+def _get_confirm_model():
+    """Build the confirmation model once; its instructions are reused by every call"""
+    global _confirm_model
+    if _confirm_model is None:
+        _confirm_model = genai.GenerativeModel(
+            'gemini-2.0-flash',
+            system_instruction=_CONFIRM_SYSTEM_INSTRUCTION
+        )
+    return _confirm_model
+
+@lru_cache(maxsize=512)
+def _ask_gemini_intent(user_response: str, context_question: str) -> str:
+    """Ask Gemini to classify an ambiguous confirmation reply (errors are not cached)"""
+    response = _get_confirm_model().generate_content(
+        f"Q: {context_question}\nA: {user_response}\nIntent:",
+        generation_config=_CONFIRM_GENERATION_CONFIG,
+        stream=True
+    )
+    # Only the first word matters, so stop at the first non-empty chunk
+    for chunk in response:
+        text = chunk.text.strip()
+        if text:
+            return text.split()[0].strip("'\".").lower()
+    return ""
+
+# ——————————————————————————————————————————————————————————————————————————————
+# Unit‑test stubs (using pytest)
+# ——————————————————————————————————————————————————————————————————————————————
+
+def test_local_intent_obvious_replies():
+    assert _match_local_intent("Yes.") == "confirm"
+    assert _match_local_intent("yeah, go ahead") == "confirm"
+    assert _match_local_intent("Do not.") == "deny"
+    assert _match_local_intent("never mind") == "cancel"
+
+def test_local_intent_leaves_refusals_to_gemini():
+    for reply in ("not ok", "that's not okay", "sure, actually never mind", "I don't think so, sure"):
+        assert _match_local_intent(reply) is None, reply
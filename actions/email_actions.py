@@ -1,14 +1,20 @@
 import os
+import mmap
 import smtplib
 import threading
 import time
 import queue
 import logging
+import logging.handlers
+import atexit
 import argparse
 import signal
+import tempfile
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Callable, List, Dict, Any
 from email.message import EmailMessage
-from jinja2 import Environment, FileSystemLoader, Template
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
 from prometheus_client import Counter, start_http_server
 from .common import get_confirmation
 import logging
@@ -38,15 +44,24 @@ from .config import (
 # ——————————————————————————————————————————————————————————————————————————————
 # Logger setup
 # ——————————————————————————————————————————————————————————————————————————————
+# File/console I/O happens on a QueueListener thread; callers only enqueue.
 logger = logging.getLogger("EmailActions")
-logger.setLevel(logging.DEBUG)
-fh = logging.FileHandler("email_actions.log")
-ch = logging.StreamHandler()
-fmt = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
-fh.setFormatter(fmt)
-ch.setFormatter(fmt)
-logger.addHandler(fh)
-logger.addHandler(ch)
+if not logger.handlers:
+    # Unknown names (e.g. NIRVAN_LOG=verbose) would make setLevel raise at import
+    _level = os.getenv("NIRVAN_LOG", "INFO").upper()
+    if _level not in logging.getLevelNamesMapping():
+        _level = "INFO"
+    logger.setLevel(_level)
+    fh = logging.FileHandler("email_actions.log")
+    ch = logging.StreamHandler()
+    fmt = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
+    fh.setFormatter(fmt)
+    ch.setFormatter(fmt)
+    _log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    _log_listener = logging.handlers.QueueListener(_log_queue, fh, ch)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
 
 # ——————————————————————————————————————————————————————————————————————————————
 # Prometheus metrics
@@ -62,6 +77,7 @@ start_http_server(METRICS_PORT)
 # Internal queues and threading
 # ——————————————————————————————————————————————————————————————————————————————
 _outgoing: queue.Queue = queue.Queue()
+_FLUSH_NOW = object()  # sentinel: wake the worker and flush the pending batch
 _shutdown_event = threading.Event()
 _pause_event = threading.Event()
 
@@ -78,9 +94,24 @@ def register_post_send_hook(fn: Callable[[str, EmailMessage, bool], None]) -> No
 # ——————————————————————————————————————————————————————————————————————————————
 # Helper: Load Jinja2 templates
 # ——————————————————————————————————————————————————————————————————————————————
+_JINJA_CACHE_DIR = os.path.join(tempfile.gettempdir(), "nirvan_jinja")
+os.makedirs(_JINJA_CACHE_DIR, exist_ok=True)
+
 _jinja_env = Environment(
     loader=FileSystemLoader(TEMPLATE_DIR),
-    autoescape=True
+    autoescape=True,
+    bytecode_cache=FileSystemBytecodeCache(_JINJA_CACHE_DIR)
+)
+
+# Templates are a small fixed set, so compile them all once up front
+_TEMPLATES: Dict[str, Template] = (
+    {
+        entry.name: _jinja_env.get_template(entry.name)
+        for entry in os.scandir(TEMPLATE_DIR)
+        if entry.is_file()
+    }
+    if os.path.isdir(TEMPLATE_DIR)
+    else {}
 )
 
 def load_template(name: str) -> Template:
@@ -88,71 +119,262 @@ def load_template(name: str) -> Template:
     Load a template by filename (e.g., 'welcome.html', 'alert.txt').
     Templates live in TEMPLATE_DIR.
     """
-    return _jinja_env.get_template(name)
+    tpl = _TEMPLATES.get(name)
+    if tpl is None:
+        tpl = _TEMPLATES[name] = _jinja_env.get_template(name)
+    return tpl
+
+@lru_cache(maxsize=256)
+def _render_cached(name: str, frozen_vars: frozenset) -> str:
+    return load_template(name).render(**dict(frozen_vars))
+
+def render_template(name: str, template_vars: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Render a template, reusing the output for identical (name, vars) payloads.
+    Falls back to a plain render when a variable value isn't hashable.
+    """
+    template_vars = template_vars or {}
+    try:
+        return _render_cached(name, frozenset(template_vars.items()))
+    except TypeError:
+        return load_template(name).render(**template_vars)
 
 # ——————————————————————————————————————————————————————————————————————————————
-# Low‑level SMTP send with retries & back‑off
+# Helper: pooled attachment read buffers
 # ——————————————————————————————————————————————————————————————————————————————
-def _smtp_send(msg: EmailMessage) -> bool:
-    attempt = 0
-    delay = 1.0
-    while attempt < RETRY_LIMIT:
+ATTACH_POOL_SIZE = 32
+
+_attach_pool: queue.LifoQueue = queue.LifoQueue(maxsize=ATTACH_POOL_SIZE)
+
+def _acquire_buffer() -> bytearray:
+    try:
+        return _attach_pool.get_nowait()
+    except queue.Empty:
+        return bytearray()
+
+def _release_buffer(buf: bytearray) -> None:
+    try:
+        _attach_pool.put_nowait(buf)
+    except queue.Full:
+        pass
+
+ATTACH_MMAP_THRESHOLD = 64 * 1024  # below this, mmap setup costs more than a read
+
+def _attach_file(msg: EmailMessage, path: str) -> None:
+    """
+    Attach a file without materialising an extra bytes copy of it.
+    add_attachment base64-encodes the data immediately, so large files are
+    encoded straight from a read-only mmap and small ones from a pooled buffer
+    that is recycled as soon as it returns.
+    """
+    maintype, subtype = ("application", "octet-stream")
+    fname = os.path.basename(path)
+    size = os.path.getsize(path)
+
+    if size >= ATTACH_MMAP_THRESHOLD:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
         try:
-            with smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=10) as server:
+            with memoryview(mm) as view:
+                msg.add_attachment(view, maintype=maintype, subtype=subtype, filename=fname)
+        finally:
+            mm.close()
+        return
+
+    buf = _acquire_buffer()
+    try:
+        if len(buf) < size:
+            buf.extend(bytes(size - len(buf)))
+        with open(path, "rb") as f, memoryview(buf) as view:
+            n = f.readinto(view[:size])
+            msg.add_attachment(view[:n], maintype=maintype, subtype=subtype, filename=fname)
+    finally:
+        _release_buffer(buf)
+
+# ——————————————————————————————————————————————————————————————————————————————
+# Low‑level SMTP sessions (pooled, reused across messages and batches)
+# ——————————————————————————————————————————————————————————————————————————————
+SMTP_POOL_SIZE = 4        # concurrent authenticated sessions per batch
+SMTP_NOOP_INTERVAL = 30   # seconds between keep-alive NOOPs on an idle session
+SMTP_IDLE_TIMEOUT = 300   # close a session after this long without sends
+
+class _PooledSMTP:
+    """One lazily-connected, reusable SMTP session slot."""
+
+    def __init__(self) -> None:
+        self.server: Optional[smtplib.SMTP] = None
+        self.last_used = 0.0
+        self.last_noop = 0.0
+
+    def connect(self) -> Optional[smtplib.SMTP]:
+        """
+        Return the authenticated session, connecting (with retries &
+        exponential back-off) if there isn't a live one.
+        """
+        if self.server is not None:
+            return self.server
+
+        attempt = 0
+        delay = 1.0
+        while attempt < RETRY_LIMIT:
+            try:
+                server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=10)
                 server.starttls()
                 server.login(EMAIL_ADDRESS, EMAIL_PASSWORD)
+                self.server = server
+                self.last_used = self.last_noop = time.time()
+                return server
+            except Exception as e:
+                attempt += 1
+                logger.warning(f"[Attempt {attempt}] SMTP connect failed: {e}")
+                time.sleep(delay)
+                delay *= 2
+        logger.error(f"All {RETRY_LIMIT} SMTP connect attempts failed")
+        return None
+
+    def close(self) -> None:
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception:
+                try:
+                    self.server.close()
+                except Exception:
+                    pass
+            self.server = None
+
+    def keepalive(self) -> None:
+        """NOOP an idle session to keep it warm, or close it once idle too long."""
+        if self.server is None:
+            return
+        now = time.time()
+        if now - self.last_used >= SMTP_IDLE_TIMEOUT:
+            logger.debug("Closing idle SMTP session")
+            self.close()
+        elif now - self.last_noop >= SMTP_NOOP_INTERVAL:
+            try:
+                self.server.noop()
+                self.last_noop = now
+            except Exception as e:
+                logger.debug(f"SMTP keep-alive failed, dropping session: {e}")
+                self.close()
+
+_smtp_slots: List[_PooledSMTP] = [_PooledSMTP() for _ in range(SMTP_POOL_SIZE)]
+_smtp_pool: queue.LifoQueue = queue.LifoQueue()
+for _slot in _smtp_slots:
+    _smtp_pool.put(_slot)
+_smtp_executor = ThreadPoolExecutor(max_workers=SMTP_POOL_SIZE, thread_name_prefix="smtp")
+
+def _smtp_connected() -> bool:
+    return any(slot.server is not None for slot in _smtp_slots)
+
+def _smtp_keepalive() -> None:
+    """Keep-alive pass over the sessions not currently in use."""
+    idle = []
+    try:
+        while True:
+            idle.append(_smtp_pool.get_nowait())
+    except queue.Empty:
+        pass
+    for slot in idle:
+        slot.keepalive()
+        _smtp_pool.put(slot)
+
+def _close_smtp_conns() -> None:
+    for slot in _smtp_slots:
+        slot.close()
+
+def _smtp_send(msg: EmailMessage) -> bool:
+    """Send one message on a pooled session, reconnecting once if dropped."""
+    slot = _smtp_pool.get()
+    try:
+        for _ in range(2):
+            server = slot.connect()
+            if server is None:
+                break
+            try:
                 server.send_message(msg)
-            EMAIL_SENT.inc()
-            logger.info(f"Sent email to {msg['To']}")
-            return True
-        except Exception as e:
-            attempt += 1
-            logger.warning(f"[Attempt {attempt}] send to {msg['To']} failed: {e}")
-            time.sleep(delay)
-            delay *= 2
+                slot.last_used = time.time()
+                EMAIL_SENT.inc()
+                logger.info(f"Sent email to {msg['To']}")
+                return True
+            except smtplib.SMTPServerDisconnected as e:
+                logger.warning(f"SMTP session dropped while sending to {msg['To']}: {e}")
+                slot.close()
+            except Exception as e:
+                logger.warning(f"Send to {msg['To']} failed: {e}")
+                break
+    finally:
+        _smtp_pool.put(slot)
     EMAIL_FAILED.inc()
-    logger.error(f"All {RETRY_LIMIT} attempts failed for {msg['To']}")
+    logger.error(f"Failed to send email to {msg['To']}")
     return False
 
+def _send_with_hooks(msg: EmailMessage) -> bool:
+    for hook in _pre_send_hooks:
+        hook(msg["To"], msg)
+    success = _smtp_send(msg)
+    for hook in _post_send_hooks:
+        hook(msg["To"], msg, success)
+    return success
+
+def _smtp_send_batch(msgs: List[EmailMessage]) -> List[bool]:
+    """
+    Send a batch, spreading messages over up to SMTP_POOL_SIZE sessions in
+    parallel. Pre/post hooks run per message inside the sending task.
+    """
+    if len(msgs) <= 1:
+        return [_send_with_hooks(msg) for msg in msgs]
+    return list(_smtp_executor.map(_send_with_hooks, msgs))
+
 # ——————————————————————————————————————————————————————————————————————————————
 # Worker: consume queue in batches
 # ——————————————————————————————————————————————————————————————————————————————
 def _worker() -> None:
     """
     Background thread that batches up to BATCH_SIZE messages every BATCH_INTERVAL seconds.
+    Blocks on the queue until a message arrives or the batch deadline expires; a
+    _FLUSH_NOW sentinel flushes the pending batch immediately.
     Honors pause and shutdown events.
     """
     batch: List[EmailMessage] = []
     last_flush = time.time()
 
     while not _shutdown_event.is_set():
+        if batch:
+            timeout = max(0.0, last_flush + BATCH_INTERVAL - time.time())
+        else:
+            # Nothing pending: sleep until work arrives, waking only for keep-alives
+            timeout = SMTP_NOOP_INTERVAL if _smtp_connected() else None
+
+        flush_now = False
         try:
-            msg: EmailMessage = _outgoing.get(timeout=1)
-            batch.append(msg)
-            EMAIL_QUEUED.inc()
+            item = _outgoing.get(timeout=timeout)
+            if item is _FLUSH_NOW:
+                flush_now = True
+            else:
+                batch.append(item)
+                EMAIL_QUEUED.inc()
         except queue.Empty:
-            pass
+            if not batch:
+                _smtp_keepalive()
+                continue
 
-        # flush on batch size or interval
+        # flush on batch size, interval or explicit request
         now = time.time()
-        if batch and (len(batch) >= BATCH_SIZE or (now - last_flush) >= BATCH_INTERVAL):
+        if batch and (flush_now or len(batch) >= BATCH_SIZE or (now - last_flush) >= BATCH_INTERVAL):
             if _pause_event.is_set():
                 logger.info("Paused: skipping batch flush")
                 last_flush = now
                 continue
 
-            for msg in batch:
-                for hook in _pre_send_hooks:
-                    hook(msg["To"], msg)
-                success = _smtp_send(msg)
-                for hook in _post_send_hooks:
-                    hook(msg["To"], msg, success)
+            _smtp_send_batch(batch)
             batch.clear()
             last_flush = now
 
     # Drain remaining on shutdown
-    for msg in batch:
-        _smtp_send(msg)
+    _smtp_send_batch(batch)
+    _close_smtp_conns()
 
 # Start worker thread on import
 _thread = threading.Thread(target=_worker, daemon=True)
@@ -164,11 +386,13 @@ _thread.start()
 def _handle_sigint(signum, frame):
     logger.info("SIGINT received, shutting down worker...")
     _shutdown_event.set()
+    _outgoing.put(_FLUSH_NOW)
 
 def _handle_sigusr1(signum, frame):
     if _pause_event.is_set():
         logger.info("Resuming email worker")
         _pause_event.clear()
+        _outgoing.put(_FLUSH_NOW)
     else:
         logger.info("Pausing email worker")
         _pause_event.set()
@@ -193,10 +417,13 @@ def send_email(
     html_template: Optional[str] = None,
     plain_template: Optional[str] = None,
     template_vars: Optional[Dict[str, Any]] = None,
-    attachments: Optional[List[str]] = None
+    attachments: Optional[List[str]] = None,
+    priority: str = "normal"
 ) -> None:
     """
     Interactive send: queues an EmailMessage with templates & attachments.
+    With priority="high" the pending batch is flushed immediately instead of
+    waiting for BATCH_INTERVAL.
     """
     if not EMAIL_ADDRESS or not EMAIL_PASSWORD:
         speak("Email not configured!").wait()
@@ -221,12 +448,10 @@ def send_email(
 
     # Render body
     if html_template:
-        tpl = load_template(html_template)
-        html = tpl.render(**(template_vars or {}))
+        html = render_template(html_template, template_vars)
         msg.add_alternative(html, subtype="html")
     if plain_template:
-        tpl = load_template(plain_template)
-        text = tpl.render(**(template_vars or {}))
+        text = render_template(plain_template, template_vars)
         msg.set_content(text)
     if not html_template and not plain_template:
         body_text = body or _ask("What’s the message?")
@@ -237,12 +462,8 @@ def send_email(
     # 4) Attachments
     for path in attachments or []:
         try:
-            with open(path, "rb") as f:
-                data = f.read()
-            maintype, subtype = ("application", "octet-stream")
-            fname = os.path.basename(path)
-            msg.add_attachment(data, maintype=maintype, subtype=subtype, filename=fname)
-            logger.info(f"Attached {fname}")
+            _attach_file(msg, path)
+            logger.info(f"Attached {os.path.basename(path)}")
         except Exception as e:
             logger.warning(f"Failed to attach {path}: {e}")
 
@@ -252,6 +473,8 @@ def send_email(
 
     # 6) Enqueue
     _outgoing.put(msg)
+    if priority == "high":
+        _outgoing.put(_FLUSH_NOW)
     speak("Email queued for sending.").wait()
 
 # ——————————————————————————————————————————————————————————————————————————————
@@ -271,6 +494,8 @@ def main() -> None:
                         help="Seconds between batch sends")
     parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
                         help="Max emails per batch")
+    parser.add_argument("--priority", choices=["normal", "high"], default="normal",
+                        help="'high' sends immediately instead of waiting for the batch")
     args = parser.parse_args()
 
     vars_dict = {k:v for k,v in (args.var or [])}
@@ -282,6 +507,7 @@ def main() -> None:
         plain_template=args.txt_tpl,
         template_vars=vars_dict,
         attachments=args.attach,
+        priority=args.priority,
     )
     # Keep process alive to flush queue
     try:
@@ -289,6 +515,7 @@ def main() -> None:
             time.sleep(1)
     except KeyboardInterrupt:
         _shutdown_event.set()
+        _outgoing.put(_FLUSH_NOW)
 
 if __name__ == "__main__":
     main()
@@ -309,6 +536,15 @@ def dummy_msg():
     m.set_content("Hello")
     return m
 
+@pytest.fixture(autouse=True)
+def reset_smtp_conns(monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda s: None)
+    for slot in _smtp_slots:
+        slot.server = None
+    yield
+    for slot in _smtp_slots:
+        slot.server = None
+
 def test_smtp_send_success(monkeypatch, dummy_msg):
     called = []
     class DummySMTP:
@@ -316,13 +552,58 @@ def test_smtp_send_success(monkeypatch, dummy_msg):
         def starttls(self): pass
         def login(self, u, p): pass
         def send_message(self, msg): called.append(msg)
-        def __enter__(self): return self
-        def __exit__(self, exc_type, exc, tb): pass
+        def quit(self): pass
 
     monkeypatch.setattr(smtplib, "SMTP", DummySMTP)
     assert _smtp_send(dummy_msg) is True
     assert called and called[0] == dummy_msg
 
+def test_smtp_send_reuses_connection(monkeypatch, dummy_msg):
+    connects = []
+    class DummySMTP:
+        def __init__(self, *args, **kwargs): connects.append(self)
+        def starttls(self): pass
+        def login(self, u, p): pass
+        def send_message(self, msg): pass
+        def quit(self): pass
+
+    monkeypatch.setattr(smtplib, "SMTP", DummySMTP)
+    assert _smtp_send(dummy_msg) is True
+    assert _smtp_send(dummy_msg) is True
+    assert len(connects) == 1
+
+def test_smtp_send_batch_uses_bounded_pool(monkeypatch, dummy_msg):
+    connects = []
+    sent = []
+    class DummySMTP:
+        def __init__(self, *args, **kwargs): connects.append(self)
+        def starttls(self): pass
+        def login(self, u, p): pass
+        def send_message(self, msg): sent.append(msg)
+        def quit(self): pass
+
+    monkeypatch.setattr(smtplib, "SMTP", DummySMTP)
+    batch = [dummy_msg] * (SMTP_POOL_SIZE * 3)
+    assert _smtp_send_batch(batch) == [True] * len(batch)
+    assert len(sent) == len(batch)
+    assert len(connects) <= SMTP_POOL_SIZE
+
+def test_smtp_send_reconnects_after_disconnect(monkeypatch, dummy_msg):
+    connects = []
+    class DummySMTP:
+        def __init__(self, *args, **kwargs): connects.append(self)
+        def starttls(self): pass
+        def login(self, u, p): pass
+        def send_message(self, msg):
+            if len(connects) == 1:
+                raise smtplib.SMTPServerDisconnected("gone")
+        def quit(self): pass
+        def close(self): pass
+
+    monkeypatch.setattr(smtplib, "SMTP", DummySMTP)
+    assert _smtp_send(dummy_msg) is True
+    assert len(connects) == 2
+
 def test_smtp_send_failure(monkeypatch, dummy_msg):
     def bad_init(*a, **k): raise smtplib.SMTPException("Bad")
     monkeypatch.setattr(smtplib, "SMTP", bad_init)
@@ -1,4 +1,7 @@
 # Nirvan_Assistant/actions/system_actions.py
+import os
+import queue
+import select
 import subprocess
 import webbrowser
 import time
@@ -6,8 +9,14 @@ import psutil
 import pyautogui
 import threading
 import platform
+from collections import deque
 import logging
+import logging.handlers
+import atexit
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Optional, List, Tuple
 # Speech functionality is now handled centrally
 import logging
@@ -18,16 +27,117 @@ def speak(text: str):
     """Placeholder - speech is handled by speech_handler"""
     logger.info(f"System action result: {text}")
 
-# Configure logging
-logging.basicConfig(filename='system_actions.log', level=logging.INFO,
-                    format='%(asctime)s - %(levelname)s - %(message)s')
+# Configure logging: hot paths only enqueue, the file write happens on a listener thread
+_root_logger = logging.getLogger()
+if not _root_logger.handlers:
+    _root_logger.setLevel(logging.INFO)
+    _log_file = logging.FileHandler('system_actions.log')
+    _log_file.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    _log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _root_logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    _log_listener = logging.handlers.QueueListener(_log_queue, _log_file)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+class RWLock:
+    """
+    Reader-writer lock: any number of readers or a single writer.
+    A waiting writer blocks new readers so it can't be starved.
+    """
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def gen_rlock(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def gen_wlock(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+# Platform is fixed for the life of the process, so resolve it once
+_IS_WIN = platform.system() == 'Windows'
+_IS_MAC = platform.system() == 'Darwin'
+_IS_LINUX = platform.system() == 'Linux'
+
+_KEY_MAP = {
+    'close_tab': 'command+w' if _IS_MAC else 'ctrl+w',
+    'play_pause': 'playpause' if _IS_MAC else 'space',
+    'next_track': 'nexttrack',
+    'alt_tab': 'command+tab' if _IS_MAC else 'alt+tab'
+}
+
+_APP_MAP = {
+    "chrome": "google chrome",
+    "notepad": "notepad.exe" if _IS_WIN else "textedit",
+    "calculator": "calc.exe" if _IS_WIN else "calculator",
+    "spotify": "spotify",
+    "vlc": "vlc",
+    "firefox": "firefox",
+    "safari": "safari",
+    "edge": "msedge"
+}
+
+# Applications registered as media players when opened
+_MEDIA_APPS = frozenset({"spotify", "vlc"})
+
+# Names open_application/close_application accept
+SUPPORTED_APPS = frozenset(_APP_MAP)
 
 # Global variables for state management
 ACTIVE_MEDIA_PLAYERS = {}
+# Registered player ids, oldest first; kept in step with ACTIVE_MEDIA_PLAYERS
+_ACTIVE_RUNNING_IDS: deque = deque()
 ACTIVE_BROWSER_TABS = {}
-MEDIA_CONTROL_LOCK = threading.Lock()
+# Tabs are only dropped when closed through us or when the browser exits, so
+# cap how many a long session can accumulate (oldest evicted first)
+MAX_TRACKED_TABS = 512
+MEDIA_CONTROL_LOCK = RWLock()
 SYSTEM_MONITOR_INTERVAL = 5  # seconds
 
+# Keystrokes settle in the background so callers don't block on the delay
+KEYPRESS_SETTLE_DELAY = 0.5  # seconds
+_KEY_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="keys")
+_KEY_LOCK = threading.Lock()
+_key_settle: Optional[Future] = None
+
+# Background bookkeeping (e.g. tab registration after a browser opens)
+BROWSER_REGISTER_DELAY = 2  # seconds
+_HOUSEKEEPING_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sysact")
+
+# Short-lived process lookup cache (lower-cased name -> (timestamp, process)).
+# Has its own lock so lookups don't contend with media/tab control.
+PROCESS_CACHE_TTL = 1.0  # seconds
+_PROC_CACHE: Dict[str, Tuple[float, psutil.Process]] = {}
+_PROC_CACHE_LOCK = threading.Lock()
+
+# Windows only: window title (lower-cased) -> last HWND that matched it
+_HWND_CACHE: Dict[str, int] = {}
+
 class SystemActionError(Exception):
     """Base exception for system action errors."""
     pass
@@ -48,42 +158,228 @@ class TabManagementError(SystemActionError):
     """Raised when tab management fails."""
     pass
 
+class ProcessListCache:
+    """
+    One shared pid -> name snapshot of the process table, refreshed at most
+    once per TTL. The monitor, status report and name lookups all read from
+    it instead of walking the process table separately.
+    """
+    def __init__(self, ttl: float = PROCESS_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._pids: Dict[int, str] = {}
+        self._fetched = 0.0
+
+    def get(self) -> Dict[int, str]:
+        """Return the pid -> name snapshot, refreshing it if it is stale."""
+        with self._lock:
+            if time.monotonic() - self._fetched < self.ttl:
+                return self._pids
+        return self.refresh()
+
+    def refresh(self) -> Dict[int, str]:
+        """Re-scan the process table, fetching only pid and name."""
+        now = time.monotonic()
+        pids = {}
+        by_name = {}
+        for proc in psutil.process_iter(attrs=['pid', 'name'], ad_value=None):
+            name = proc.info['name']
+            pids[proc.info['pid']] = name
+            if name:
+                by_name.setdefault(name.lower(), (now, proc))
+        with self._lock:
+            self._pids = pids
+            self._fetched = now
+        # Fill the name lookup cache from the same pass
+        with _PROC_CACHE_LOCK:
+            _PROC_CACHE.clear()
+            _PROC_CACHE.update(by_name)
+        return pids
+
+PROCESS_LIST = ProcessListCache()
+
+class _ProcessExitWatcher:
+    """
+    Waits on process exit events instead of polling is_running().
+    Uses pidfd_open + epoll on Linux and kqueue NOTE_EXIT on macOS/BSD;
+    `available` is False where neither exists and the monitor falls back
+    to periodic sweeps.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pidfd_to_id: Dict[int, deque] = {}  # pidfd (or pid for kqueue) -> tracked ids
+        self._pid_token: Dict[int, int] = {}
+        self._exited: List[str] = []
+        self._epoll = None
+        self._kqueue = None
+        # Self-pipe so wake() can interrupt a blocked wait()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        try:
+            if hasattr(os, 'pidfd_open') and hasattr(select, 'epoll'):
+                self._epoll = select.epoll()
+                self._epoll.register(self._wake_r, select.EPOLLIN)
+            elif hasattr(select, 'kqueue'):
+                self._kqueue = select.kqueue()
+                self._kqueue.control([select.kevent(
+                    self._wake_r, filter=select.KQ_FILTER_READ,
+                    flags=select.KQ_EV_ADD)], 0)
+        except OSError as e:
+            logging.warning(f"Process exit watcher unavailable: {str(e)}")
+        self.available = self._epoll is not None or self._kqueue is not None
+
+    def watch(self, pid: int, tracked_id: str):
+        """Report tracked_id from wait() once pid exits."""
+        if not self.available:
+            return
+        with self._lock:
+            token = self._pid_token.get(pid)
+            if token is not None:
+                self._pidfd_to_id[token].append(tracked_id)
+                return
+            try:
+                if self._epoll is not None:
+                    token = os.pidfd_open(pid)
+                    self._epoll.register(token, select.EPOLLIN)
+                else:
+                    token = pid
+                    self._kqueue.control([select.kevent(
+                        pid, filter=select.KQ_FILTER_PROC,
+                        flags=select.KQ_EV_ADD | select.KQ_EV_ONESHOT,
+                        fflags=select.KQ_NOTE_EXIT)], 0)
+            except ProcessLookupError:
+                self._exited.append(tracked_id)
+                return
+            except OSError as e:
+                # e.g. kernel older than 5.3; fall back to sweeping
+                logging.warning(f"Process exit watch failed, falling back to polling: {str(e)}")
+                self.available = False
+                return
+            self._pid_token[pid] = token
+            # Bounded like the registries it mirrors: a long-lived browser
+            # can collect one id per search
+            self._pidfd_to_id[token] = deque([tracked_id], maxlen=MAX_TRACKED_TABS)
+
+    def wait(self, timeout: float) -> List[str]:
+        """Block up to timeout seconds and return the ids whose process exited."""
+        with self._lock:
+            exited, self._exited = self._exited, []
+        if exited:
+            return exited
+
+        if self._epoll is not None:
+            tokens = [fd for fd, _ in self._epoll.poll(timeout)
+                      if fd != self._wake_r]
+        else:
+            tokens = [ev.ident for ev in self._kqueue.control(None, 64, timeout)
+                      if ev.filter == select.KQ_FILTER_PROC]
+        self._drain_wakeups()
+
+        with self._lock:
+            for token in tokens:
+                exited.extend(self._pidfd_to_id.pop(token, ()))
+                for pid, t in list(self._pid_token.items()):
+                    if t == token:
+                        del self._pid_token[pid]
+                if self._epoll is not None:
+                    self._epoll.unregister(token)
+                    os.close(token)
+        return exited
+
+    def wake(self):
+        """Make a blocked wait() return immediately."""
+        try:
+            os.write(self._wake_w, b'\0')
+        except OSError:
+            pass
+
+    def _drain_wakeups(self):
+        try:
+            while os.read(self._wake_r, 64):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+_EXIT_WATCHER = _ProcessExitWatcher()
+
 class SystemMonitor(threading.Thread):
     """Background thread to monitor system resources and application states."""
     def __init__(self):
         super().__init__(daemon=True)
         self.running = True
         self.start_time = time.time()
+        self._stop_event = threading.Event()
         
     def run(self):
         logging.info("System monitor started")
-        while self.running:
+        while not self._stop_event.is_set():
             try:
-                self._check_browser_tabs()
-                self._check_media_players()
-                time.sleep(SYSTEM_MONITOR_INTERVAL)
+                if _EXIT_WATCHER.available:
+                    # Wakes when a tracked process dies or stop() is called
+                    for tracked_id in _EXIT_WATCHER.wait(SYSTEM_MONITOR_INTERVAL):
+                        self._forget(tracked_id)
+                else:
+                    self._check_browser_tabs()
+                    self._check_media_players()
+                    self._stop_event.wait(SYSTEM_MONITOR_INTERVAL)
             except Exception as e:
-                logging.error(f"System monitor error: {str(e)}")
-                
+                logging.error("System monitor error: %s", e)
+                self._stop_event.wait(SYSTEM_MONITOR_INTERVAL)
+
+    def _forget(self, tracked_id: str):
+        """Drop a tab or media player whose process has exited."""
+        with MEDIA_CONTROL_LOCK.gen_wlock():
+            tab_info = ACTIVE_BROWSER_TABS.pop(tracked_id, None)
+            if tab_info:
+                logging.info("Cleaning up closed tab: %s", tab_info['url'])
+            player_info = _drop_player(tracked_id)
+            if player_info:
+                logging.info("Cleaning up closed media player: %s", player_info['name'])
+                    
+    @staticmethod
+    def _is_alive(proc: psutil.Process, running: Dict[int, str]) -> bool:
+        """Check a tracked process against the shared snapshot, then its own state."""
+        if proc.pid not in running:
+            return False
+        try:
+            # is_running() and status() share a single procfs read here
+            with proc.oneshot():
+                return proc.is_running() and proc.status() != psutil.STATUS_ZOMBIE
+        except psutil.Error:
+            return False
+
     def _check_browser_tabs(self):
         """Check and clean up closed browser tabs."""
-        with MEDIA_CONTROL_LOCK:
-            for tab_id, tab_info in list(ACTIVE_BROWSER_TABS.items()):
-                if not tab_info['process'].is_running():
-                    logging.info(f"Cleaning up closed tab: {tab_info['url']}")
+        running = PROCESS_LIST.get()
+        # Probe processes on a snapshot so the write lock is only held to pop
+        with MEDIA_CONTROL_LOCK.gen_rlock():
+            tabs = list(ACTIVE_BROWSER_TABS.items())
+        closed = [(tab_id, tab_info) for tab_id, tab_info in tabs
+                  if not self._is_alive(tab_info['process'], running)]
+        if closed:
+            with MEDIA_CONTROL_LOCK.gen_wlock():
+                for tab_id, tab_info in closed:
+                    logging.info("Cleaning up closed tab: %s", tab_info['url'])
                     ACTIVE_BROWSER_TABS.pop(tab_id, None)
                     
     def _check_media_players(self):
         """Check and clean up closed media players."""
-        with MEDIA_CONTROL_LOCK:
-            for player_id, player_info in list(ACTIVE_MEDIA_PLAYERS.items()):
-                if not player_info['process'].is_running():
-                    logging.info(f"Cleaning up closed media player: {player_info['name']}")
-                    ACTIVE_MEDIA_PLAYERS.pop(player_id, None)
+        running = PROCESS_LIST.get()
+        with MEDIA_CONTROL_LOCK.gen_rlock():
+            players = list(ACTIVE_MEDIA_PLAYERS.items())
+        closed = [(player_id, player_info) for player_id, player_info in players
+                  if not self._is_alive(player_info['process'], running)]
+        if closed:
+            with MEDIA_CONTROL_LOCK.gen_wlock():
+                for player_id, player_info in closed:
+                    logging.info("Cleaning up closed media player: %s", player_info['name'])
+                    _drop_player(player_id)
     
     def stop(self):
-        """Stop the monitoring thread."""
+        """Stop the monitoring thread, waking it if it is blocked."""
         self.running = False
+        self._stop_event.set()
+        _EXIT_WATCHER.wake()
         logging.info("System monitor stopped")
 
 # Start system monitor
@@ -92,28 +388,63 @@ SYSTEM_MONITOR.start()
 
 def _get_platform_key(key_name: str) -> str:
     """Get platform-specific key mapping."""
-    key_map = {
-        'close_tab': 'command+w' if platform.system() == 'Darwin' else 'ctrl+w',
-        'play_pause': 'playpause' if platform.system() == 'Darwin' else 'space',
-        'next_track': 'nexttrack' if platform.system() == 'Darwin' else 'nexttrack',
-        'alt_tab': 'command+tab' if platform.system() == 'Darwin' else 'alt+tab'
-    }
-    return key_map.get(key_name, '')
+    return _KEY_MAP.get(key_name, '')
 
 def _find_process_by_name(process_name: str) -> Optional[psutil.Process]:
-    """Find a process by name."""
-    for proc in psutil.process_iter(['name']):
-        if proc.info['name'] == process_name:
+    """Find a process by name, re-scanning the process table only on a cache miss."""
+    key = process_name.lower()
+    with _PROC_CACHE_LOCK:
+        entry = _PROC_CACHE.get(key)
+    if entry:
+        ts, proc = entry
+        if time.monotonic() - ts < PROCESS_CACHE_TTL and proc.is_running():
             return proc
+
+    proc = _scan_for_process(key)
+    if proc:
+        with _PROC_CACHE_LOCK:
+            _PROC_CACHE[key] = (time.monotonic(), proc)
+    return proc
+
+def _process_name(pid: int) -> Optional[str]:
+    """Name of pid, read straight from /proc/<pid>/comm on Linux."""
+    if _IS_LINUX:
+        try:
+            with open(f'/proc/{pid}/comm', 'rb') as f:
+                name = f.read().rstrip(b'\n').decode(errors='replace')
+        except OSError:
+            return None
+        # comm is truncated to 15 characters; let psutil resolve the full name
+        if len(name) < 15:
+            return name
+    try:
+        return psutil.Process(pid).name()
+    except psutil.Error:
+        return None
+
+def _scan_for_process(target: str) -> Optional[psutil.Process]:
+    """Walk the pid list and stop at the first process named target (lower-case)."""
+    for pid in psutil.pids():
+        name = _process_name(pid)
+        if name and name.lower() == target:
+            try:
+                return psutil.Process(pid)
+            except psutil.NoSuchProcess:
+                continue
     return None
 
+def _invalidate_process_cache(process_name: str):
+    """Drop a cached process lookup, e.g. after the process was closed."""
+    with _PROC_CACHE_LOCK:
+        _PROC_CACHE.pop(process_name.lower(), None)
+
 def _get_active_window_title() -> str:
     """Get active window title."""
     try:
-        if platform.system() == 'Windows':
+        if _IS_WIN:
             import win32gui
             return win32gui.GetWindowText(win32gui.GetForegroundWindow())
-        elif platform.system() == 'Darwin':
+        elif _IS_MAC:
             from AppKit import NSWorkspace
             return NSWorkspace.sharedWorkspace().activeApplication()['NSApplicationName']
         else:
@@ -125,24 +456,46 @@ def _get_active_window_title() -> str:
         logging.error(f"Error getting active window: {str(e)}")
         return ""
 
+def _invalidate_window_cache(window_title: str):
+    """Forget the cached window handle for window_title."""
+    _HWND_CACHE.pop(window_title.lower(), None)
+
 def _activate_window(window_title: str) -> bool:
     """Activate window by title."""
     try:
-        if platform.system() == 'Windows':
+        if _IS_WIN:
             import win32gui
             import win32con
             
-            def callback(hwnd, extra):
-                if window_title.lower() in win32gui.GetWindowText(hwnd).lower():
-                    win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
-                    win32gui.SetForegroundWindow(hwnd)
-                    return False
-                return True
-                
-            win32gui.EnumWindows(callback, None)
+            key = window_title.lower()
+            hwnd = _HWND_CACHE.get(key)
+            if not (hwnd and win32gui.IsWindow(hwnd)
+                    and key in win32gui.GetWindowText(hwnd).lower()):
+                # Cache miss or stale handle: one EnumWindows scan
+                found = []
+
+                def callback(hwnd, extra):
+                    if key in win32gui.GetWindowText(hwnd).lower():
+                        found.append(hwnd)
+                        return False
+                    return True
+
+                try:
+                    win32gui.EnumWindows(callback, None)
+                except win32gui.error:
+                    pass  # raised when the callback stops the enumeration early
+                hwnd = found[0] if found else None
+                if hwnd:
+                    _HWND_CACHE[key] = hwnd
+                else:
+                    _HWND_CACHE.pop(key, None)
+
+            if hwnd:
+                win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+                win32gui.SetForegroundWindow(hwnd)
             return True
             
-        elif platform.system() == 'Darwin':
+        elif _IS_MAC:
             from AppKit import NSWorkspace
             apps = NSWorkspace.sharedWorkspace().runningApplications()
             for app in apps:
@@ -160,74 +513,99 @@ def _activate_window(window_title: str) -> bool:
         return False
 
 def _simulate_keypress(keys: str) -> bool:
-    """Simulate keypress with error handling and delays."""
+    """Simulate keypress; the post-action delay runs asynchronously."""
+    global _key_settle
     try:
-        # Human interaction delay
-        time.sleep(0.5)
-        
-        if '+' in keys:
-            keys = keys.split('+')
-            pyautogui.hotkey(*keys)
-        else:
-            pyautogui.press(keys)
-            
-        time.sleep(0.5)  # Post-action delay
+        with _KEY_LOCK:
+            # Only wait if the previous keystroke hasn't settled yet
+            if _key_settle is not None:
+                _key_settle.result()
+
+            if '+' in keys:
+                keys = keys.split('+')
+                pyautogui.hotkey(*keys)
+            else:
+                pyautogui.press(keys)
+
+            _key_settle = _KEY_EXECUTOR.submit(time.sleep, KEYPRESS_SETTLE_DELAY)
         return True
     except Exception as e:
-        logging.error(f"Keypress simulation failed: {str(e)}")
+        logging.error("Keypress simulation failed: %s", e)
         return False
 
-def _register_media_player(player_name: str) -> str:
+def _spawn_process(command: str) -> psutil.Process:
+    """
+    Launch command with posix_spawnp. Unlike fork+exec this doesn't scale with
+    the assistant's resident size, and it returns only after the exec succeeded.
+    """
+    pid = os.posix_spawnp(command, [command], os.environ)
+    # Nothing else waits on this child, so reap it when it exits
+    threading.Thread(target=os.waitpid, args=(pid, 0), daemon=True).start()
+    proc = psutil.Process(pid)
+    with _PROC_CACHE_LOCK:
+        _PROC_CACHE[command.lower()] = (time.monotonic(), proc)
+    return proc
+
+def _popen_process(command: str) -> psutil.Process:
+    """
+    Launch command with Popen and wrap its pid directly. No shell is used,
+    so on Windows the pid is the application's rather than cmd.exe's.
+    """
+    popen = subprocess.Popen([command])
+    try:
+        proc = psutil.Process(popen.pid)
+    except psutil.NoSuchProcess:
+        raise ApplicationNotFoundError(f"'{command}' exited immediately after starting")
+    with _PROC_CACHE_LOCK:
+        _PROC_CACHE[command.lower()] = (time.monotonic(), proc)
+    return proc
+
+def _register_media_player(player_name: str, proc: Optional[psutil.Process] = None) -> str:
     """Register a new media player."""
-    with MEDIA_CONTROL_LOCK:
-        player_id = f"media_{time.time()}"
-        try:
-            proc = _find_process_by_name(player_name)
-            if proc:
+    player_id = f"media_{time.monotonic_ns()}"
+    try:
+        # Look the process up before taking the write lock
+        proc = proc or _find_process_by_name(player_name)
+        if proc:
+            with MEDIA_CONTROL_LOCK.gen_wlock():
                 ACTIVE_MEDIA_PLAYERS[player_id] = {
                     'name': player_name,
                     'process': proc,
                     'last_activity': time.time()
                 }
-                return player_id
-        except Exception as e:
-            logging.error(f"Error registering media player: {str(e)}")
+                _ACTIVE_RUNNING_IDS.append(player_id)
+            _EXIT_WATCHER.watch(proc.pid, player_id)
+            return player_id
+    except Exception as e:
+        logging.error("Error registering media player: %s", e)
     return ""
 
-def _register_browser_tab(url: str, browser_name: str) -> str:
+def _register_browser_tab(url: str, browser_name: str, tab_id: str = "") -> str:
     """Register a new browser tab."""
-    with MEDIA_CONTROL_LOCK:
-        tab_id = f"tab_{time.time()}"
-        try:
-            proc = _find_process_by_name(browser_name)
-            if proc:
+    tab_id = tab_id or f"tab_{time.monotonic_ns()}"
+    try:
+        proc = _find_process_by_name(browser_name)
+        if proc:
+            with MEDIA_CONTROL_LOCK.gen_wlock():
                 ACTIVE_BROWSER_TABS[tab_id] = {
                     'url': url,
                     'browser': browser_name,
                     'process': proc,
                     'last_accessed': time.time()
                 }
-                return tab_id
-        except Exception as e:
-            logging.error(f"Error registering browser tab: {str(e)}")
+                while len(ACTIVE_BROWSER_TABS) > MAX_TRACKED_TABS:
+                    ACTIVE_BROWSER_TABS.pop(next(iter(ACTIVE_BROWSER_TABS)))
+            _EXIT_WATCHER.watch(proc.pid, tab_id)
+            return tab_id
+    except Exception as e:
+        logging.error("Error registering browser tab: %s", e)
     return ""
 
 # Application Management Functions
 def open_application(app_name: str) -> str:
     """Opens a system application with enhanced error handling."""
-    app_map = {
-        "chrome": "google chrome",
-        "notepad": "notepad.exe" if platform.system() == 'Windows' else "textedit",
-        "calculator": "calc.exe" if platform.system() == 'Windows' else "calculator",
-        "spotify": "spotify",
-        "vlc": "vlc",
-        "firefox": "firefox",
-        "safari": "safari",
-        "edge": "msedge"
-    }
-    
     normalized_name = app_name.lower()
-    command = app_map.get(normalized_name)
+    command = _APP_MAP.get(normalized_name)
     
     if not command:
         msg = f"Application '{app_name}' is not configured"
@@ -242,26 +620,16 @@ def open_application(app_name: str) -> str:
             speak(f"{app_name} is already running")
             return ""
 
-        # Launch new process
-        if platform.system() == 'Windows':
-            subprocess.Popen(command, shell=True)
+        # Launch new process; both paths hand back the process directly
+        if not _IS_WIN and hasattr(os, 'posix_spawnp'):
+            proc = _spawn_process(command)
         else:
-            subprocess.Popen([command])
-            
-        # Wait for application to start
-        start_time = time.time()
-        while time.time() - start_time < 5:  # 5 second timeout
-            if _find_process_by_name(command):
-                speak(f"Opening {app_name}")
-                
-                # Register media player if applicable
-                if normalized_name in ['spotify', 'vlc']:
-                    return _register_media_player(command)
-                    
-                return ""
-            time.sleep(0.5)
-            
-        raise ApplicationNotFoundError(f"Timed out waiting for {app_name} to start")
+            proc = _popen_process(command)
+
+        speak(f"Opening {app_name}")
+        if normalized_name in _MEDIA_APPS:
+            return _register_media_player(command, proc)
+        return ""
         
     except FileNotFoundError:
         msg = f"Application '{app_name}' not found on system"
@@ -284,19 +652,8 @@ def open_application(app_name: str) -> str:
 
 def close_application(app_name: str) -> bool:
     """Closes a running application."""
-    app_map = {
-        "chrome": "google chrome",
-        "notepad": "notepad.exe" if platform.system() == 'Windows' else "textedit",
-        "calculator": "calc.exe" if platform.system() == 'Windows' else "calculator",
-        "spotify": "spotify",
-        "vlc": "vlc",
-        "firefox": "firefox",
-        "safari": "safari",
-        "edge": "msedge"
-    }
-    
     normalized_name = app_name.lower()
-    command = app_map.get(normalized_name)
+    command = _APP_MAP.get(normalized_name)
     
     if not command:
         msg = f"Application '{app_name}' is not configured for closing"
@@ -315,16 +672,18 @@ def close_application(app_name: str) -> bool:
         proc.terminate()
         
         # Wait for process to terminate
-        start_time = time.time()
-        while time.time() - start_time < 5:
+        deadline = time.monotonic() + 5.0
+        while time.monotonic() < deadline:
             if not _find_process_by_name(command):
                 speak(f"Closed {app_name}")
+                _invalidate_process_cache(command)
+                _invalidate_window_cache(command)
                 
                 # Clean up media players
-                with MEDIA_CONTROL_LOCK:
+                with MEDIA_CONTROL_LOCK.gen_wlock():
                     for player_id, player_info in list(ACTIVE_MEDIA_PLAYERS.items()):
                         if player_info['name'] == command:
-                            ACTIVE_MEDIA_PLAYERS.pop(player_id, None)
+                            _drop_player(player_id)
                 return True
             time.sleep(0.5)
             
@@ -347,29 +706,51 @@ def close_application(app_name: str) -> bool:
     return False
 
 # Browser Management Functions
+def _deferred_register(tab_id: str, url: str):
+    """Register a tab once the browser has had time to start."""
+    time.sleep(BROWSER_REGISTER_DELAY)
+    try:
+        _register_browser_tab(url, _default_browser(), tab_id)
+    except Exception as e:
+        logging.error("Deferred tab registration failed: %s", e)
+
+def _open_in_browser(url: str) -> str:
+    """Open url and return its tab id at once; registration happens in the background."""
+    _default_browser_controller().open(url)
+    tab_id = f"tab_{time.monotonic_ns()}"
+    _HOUSEKEEPING_EXECUTOR.submit(_deferred_register, tab_id, url)
+    return tab_id
+
+_BROWSER_PATTERNS = (
+    ('chrome', 'chrome' if _IS_WIN else 'Google Chrome'),
+    ('firefox', 'firefox'),
+    ('safari', 'Safari'),
+)
+
+def _canonical_browser(raw: str) -> str:
+    """Map a webbrowser controller name to the process name we track."""
+    raw = raw.lower()
+    for pattern, name in _BROWSER_PATTERNS:
+        if pattern in raw:
+            return name
+    return 'msedge'
+
+@lru_cache(maxsize=1)
+def _default_browser_controller() -> webbrowser.BaseBrowser:
+    """The default browser controller, looked up once and reused for every open."""
+    return webbrowser.get()
+
+@lru_cache(maxsize=1)
+def _default_browser() -> str:
+    """Process name of the default browser."""
+    return _canonical_browser(_default_browser_controller().name)
+
 def search_web(query: str) -> str:
     """Opens the web browser to search for a query with tab registration."""
     try:
         url = f"https://www.google.com/search?q={query}"
-        webbrowser.open(url)
+        tab_id = _open_in_browser(url)
         speak(f"Searching for {query}")
-        
-        # Wait for browser to open
-        time.sleep(2)
-        
-        # Get browser name from user agent
-        browser_name = webbrowser.get().name
-        if 'chrome' in browser_name.lower():
-            browser_name = 'chrome' if platform.system() == 'Windows' else 'Google Chrome'
-        elif 'firefox' in browser_name.lower():
-            browser_name = 'firefox'
-        elif 'safari' in browser_name.lower():
-            browser_name = 'Safari'
-        else:
-            browser_name = 'msedge'
-            
-        # Register new tab
-        tab_id = _register_browser_tab(url, browser_name)
         return tab_id
         
     except Exception as e:
@@ -384,25 +765,8 @@ def open_url(url: str) -> str:
         if not url.startswith(('http://', 'https://')):
             url = 'https://' + url
             
-        webbrowser.open(url)
+        tab_id = _open_in_browser(url)
         speak(f"Opening {url}")
-        
-        # Wait for browser to open
-        time.sleep(2)
-        
-        # Get browser name
-        browser_name = webbrowser.get().name
-        if 'chrome' in browser_name.lower():
-            browser_name = 'chrome' if platform.system() == 'Windows' else 'Google Chrome'
-        elif 'firefox' in browser_name.lower():
-            browser_name = 'firefox'
-        elif 'safari' in browser_name.lower():
-            browser_name = 'Safari'
-        else:
-            browser_name = 'msedge'
-            
-        # Register new tab
-        tab_id = _register_browser_tab(url, browser_name)
         return tab_id
         
     except Exception as e:
@@ -446,24 +810,26 @@ def close_current_tab() -> bool:
 def close_browser_tab(tab_id: str) -> bool:
     """Closes a specific browser tab by ID."""
     try:
-        with MEDIA_CONTROL_LOCK:
+        with MEDIA_CONTROL_LOCK.gen_rlock():
             tab_info = ACTIVE_BROWSER_TABS.get(tab_id)
-            if not tab_info:
-                raise TabManagementError("Tab not found")
-                
-            # Activate the browser window
-            if not _activate_window(tab_info['browser']):
-                raise TabManagementError("Failed to activate browser")
-                
-            # Close the tab
-            keys = _get_platform_key('close_tab')
-            if not _simulate_keypress(keys):
-                raise TabManagementError("Failed to simulate key press")
-                
-            # Remove from tracking
+        if not tab_info:
+            raise TabManagementError("Tab not found")
+            
+        # Activate the browser window
+        if not _activate_window(tab_info['browser']):
+            raise TabManagementError("Failed to activate browser")
+            
+        # Close the tab
+        keys = _get_platform_key('close_tab')
+        if not _simulate_keypress(keys):
+            raise TabManagementError("Failed to simulate key press")
+            
+        # Remove from tracking
+        with MEDIA_CONTROL_LOCK.gen_wlock():
             ACTIVE_BROWSER_TABS.pop(tab_id, None)
-            speak("Tab closed")
-            return True
+        _invalidate_window_cache(tab_info['browser'])
+        speak("Tab closed")
+        return True
             
     except TabManagementError as e:
         msg = f"Error closing tab: {str(e)}"
@@ -476,37 +842,47 @@ def close_browser_tab(tab_id: str) -> bool:
     return False
 
 # Media Control Functions
+def _drop_player(player_id: str) -> Optional[dict]:
+    """Remove a media player from tracking. Caller holds the write lock."""
+    player_info = ACTIVE_MEDIA_PLAYERS.pop(player_id, None)
+    if player_info:
+        try:
+            _ACTIVE_RUNNING_IDS.remove(player_id)
+        except ValueError:
+            pass
+    return player_info
+
+def _pick_player(player_id: str) -> Tuple[str, Optional[dict]]:
+    """Resolve player_id, or fall back to the oldest tracked player."""
+    with MEDIA_CONTROL_LOCK.gen_rlock():
+        player_info = ACTIVE_MEDIA_PLAYERS.get(player_id) if player_id else None
+        if not player_info and _ACTIVE_RUNNING_IDS:
+            # Exited players are dropped by the monitor, so no is_running() probe here
+            player_id = _ACTIVE_RUNNING_IDS[0]
+            player_info = ACTIVE_MEDIA_PLAYERS.get(player_id)
+    return player_id, player_info
+
 def play_pause_media(player_id: str = "") -> bool:
     """Toggles play/pause for media player."""
     try:
-        with MEDIA_CONTROL_LOCK:
-            player_info = None
-            if player_id:
-                player_info = ACTIVE_MEDIA_PLAYERS.get(player_id)
-                
-            # If no player specified, find active player
-            if not player_info:
-                for pid, info in ACTIVE_MEDIA_PLAYERS.items():
-                    if info['process'].is_running():
-                        player_info = info
-                        player_id = pid
-                        break
-                        
-            if not player_info:
-                raise MediaControlError("No active media player found")
-                
-            # Activate the media player window
-            if not _activate_window(player_info['name']):
-                raise MediaControlError("Failed to activate media player")
-                
-            # Send play/pause command
-            keys = _get_platform_key('play_pause')
-            if not _simulate_keypress(keys):
-                raise MediaControlError("Failed to simulate key press")
-                
-            ACTIVE_MEDIA_PLAYERS[player_id]['last_activity'] = time.time()
-            speak("Media play/pause toggled")
-            return True
+        player_id, player_info = _pick_player(player_id)
+        if not player_info:
+            raise MediaControlError("No active media player found")
+            
+        # Activate the media player window
+        if not _activate_window(player_info['name']):
+            raise MediaControlError("Failed to activate media player")
+            
+        # Send play/pause command
+        keys = _get_platform_key('play_pause')
+        if not _simulate_keypress(keys):
+            raise MediaControlError("Failed to simulate key press")
+            
+        with MEDIA_CONTROL_LOCK.gen_wlock():
+            if player_id in ACTIVE_MEDIA_PLAYERS:
+                ACTIVE_MEDIA_PLAYERS[player_id]['last_activity'] = time.time()
+        speak("Media play/pause toggled")
+        return True
             
     except MediaControlError as e:
         msg = f"Error controlling media: {str(e)}"
@@ -521,33 +897,24 @@ def play_pause_media(player_id: str = "") -> bool:
 def next_track(player_id: str = "") -> bool:
     """Skips to next track for media player."""
     try:
-        with MEDIA_CONTROL_LOCK:
-            player_info = None
-            if player_id:
-                player_info = ACTIVE_MEDIA_PLAYERS.get(player_id)
-                
-            if not player_info:
-                for pid, info in ACTIVE_MEDIA_PLAYERS.items():
-                    if info['process'].is_running():
-                        player_info = info
-                        player_id = pid
-                        break
-                        
-            if not player_info:
-                raise MediaControlError("No active media player found")
-                
-            # Activate the media player window
-            if not _activate_window(player_info['name']):
-                raise MediaControlError("Failed to activate media player")
-                
-            # Send next track command
-            keys = _get_platform_key('next_track')
-            if not _simulate_keypress(keys):
-                raise MediaControlError("Failed to simulate key press")
-                
-            ACTIVE_MEDIA_PLAYERS[player_id]['last_activity'] = time.time()
-            speak("Skipping to next track")
-            return True
+        player_id, player_info = _pick_player(player_id)
+        if not player_info:
+            raise MediaControlError("No active media player found")
+            
+        # Activate the media player window
+        if not _activate_window(player_info['name']):
+            raise MediaControlError("Failed to activate media player")
+            
+        # Send next track command
+        keys = _get_platform_key('next_track')
+        if not _simulate_keypress(keys):
+            raise MediaControlError("Failed to simulate key press")
+            
+        with MEDIA_CONTROL_LOCK.gen_wlock():
+            if player_id in ACTIVE_MEDIA_PLAYERS:
+                ACTIVE_MEDIA_PLAYERS[player_id]['last_activity'] = time.time()
+        speak("Skipping to next track")
+        return True
             
     except MediaControlError as e:
         msg = f"Error controlling media: {str(e)}"
@@ -562,30 +929,38 @@ def next_track(player_id: str = "") -> bool:
 def close_all_media_players() -> bool:
     """Closes all registered media players."""
     try:
-        with MEDIA_CONTROL_LOCK:
-            if not ACTIVE_MEDIA_PLAYERS:
-                speak("No media players are active")
-                return True
-                
-            success = True
-            for player_id, player_info in list(ACTIVE_MEDIA_PLAYERS.items()):
-                try:
-                    if player_info['process'].is_running():
-                        player_info['process'].terminate()
-                        # Wait for termination
-                        for _ in range(5):
-                            if not player_info['process'].is_running():
-                                break
-                            time.sleep(1)
-                        else:
-                            success = False
-                except Exception:
-                    success = False
-                finally:
-                    ACTIVE_MEDIA_PLAYERS.pop(player_id, None)
-                    
-            speak("All media players closed" if success else "Some media players couldn't be closed")
-            return success
+        with MEDIA_CONTROL_LOCK.gen_wlock():
+            players = list(ACTIVE_MEDIA_PLAYERS.values())
+            ACTIVE_MEDIA_PLAYERS.clear()
+            _ACTIVE_RUNNING_IDS.clear()
+        if not players:
+            speak("No media players are active")
+            return True
+
+        # Several entries may share a process; terminate each one once
+        procs = list({info['process'].pid: info['process'] for info in players}.values())
+        success = True
+        for proc in procs:
+            try:
+                proc.terminate()
+            except psutil.NoSuchProcess:
+                pass
+            except Exception:
+                success = False
+
+        # One wait for all of them rather than up to 5s per player
+        _, alive = psutil.wait_procs(procs, timeout=5)
+        for proc in alive:
+            try:
+                proc.kill()
+            except psutil.NoSuchProcess:
+                pass
+        if alive:
+            _, alive = psutil.wait_procs(alive, timeout=1)
+            success = success and not alive
+
+        speak("All media players closed" if success else "Some media players couldn't be closed")
+        return success
             
     except Exception as e:
         msg = f"Error closing media players: {str(e)}"
@@ -594,6 +969,22 @@ def close_all_media_players() -> bool:
         return False
 
 # System Information Functions
+# Disk usage and process count change slowly; refresh them once per monitor interval
+_status_cache: Tuple[float, dict] = (0.0, {})
+
+def _slow_status() -> dict:
+    """Disk usage and process count, cached for SYSTEM_MONITOR_INTERVAL."""
+    global _status_cache
+    ts, cached = _status_cache
+    if cached and time.monotonic() - ts < SYSTEM_MONITOR_INTERVAL:
+        return cached
+    cached = {
+        'disk_percent': psutil.disk_usage('/').percent,
+        'process_count': len(PROCESS_LIST.get()),
+    }
+    _status_cache = (time.monotonic(), cached)
+    return cached
+
 def get_system_status() -> str:
     """Returns system status information."""
     try:
@@ -606,12 +997,12 @@ def get_system_status() -> str:
         mem = psutil.virtual_memory()
         status.append(f"Memory Usage: {mem.percent}%")
         
+        slow = _slow_status()
         # Disk Usage
-        disk = psutil.disk_usage('/')
-        status.append(f"Disk Usage: {disk.percent}%")
+        status.append(f"Disk Usage: {slow['disk_percent']}%")
         
         # Active applications
-        status.append(f"Active Applications: {len(psutil.process_iter())}")
+        status.append(f"Active Applications: {slow['process_count']}")
         
         # Media players
         status.append(f"Active Media Players: {len(ACTIVE_MEDIA_PLAYERS)}")
@@ -628,8 +1019,8 @@ def get_system_status() -> str:
 def cleanup_system_actions():
     """Clean up resources when system actions are terminated."""
     SYSTEM_MONITOR.stop()
+    SYSTEM_MONITOR.join(timeout=1)
     logging.info("System actions module cleaned up")
 
 # Register cleanup handler
-import atexit
 atexit.register(cleanup_system_actions)
\ No newline at end of file
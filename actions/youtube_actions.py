@@ -33,18 +33,24 @@ Date   :  2025-07-23
 from __future__ import annotations
 
 import atexit
+import json
 import logging
 import os
 import random
+import socket
 import sys
 import threading
 import time
+from collections import OrderedDict, defaultdict
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
 from dataclasses import dataclass, field
+from functools import cached_property
 from types import TracebackType
-from typing import Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple, Type, Union
+from urllib.error import HTTPError
 
 from pytube import Search
+from pytube import request as _pytube_request
 from selenium.common.exceptions import (
     JavascriptException,
     NoSuchElementException,
@@ -52,6 +58,7 @@ from selenium.common.exceptions import (
     WebDriverException,
 )
 from selenium.webdriver import Chrome, ChromeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from tenacity import (
@@ -62,6 +69,11 @@ from tenacity import (
 )
 from webdriver_manager.chrome import ChromeDriverManager
 
+try:  # installed alongside selenium / webdriver-manager
+    import requests
+except ImportError:
+    requests = None
+
 # ==============================================================================
 # Optional project-level helper (non-fatal if missing)
 # ==============================================================================
@@ -106,6 +118,9 @@ _K_PREVIOUS    = Keys.SHIFT + "p"
 _DEFAULT_TIMEOUT_SECS = 15
 _HUMAN_DELAY_RANGE    = (0.15, 0.6)  # seconds
 
+_SEARCH_CACHE_SIZE     = 512
+_SEARCH_CACHE_TTL_SECS = 1800
+
 
 def human_delay() -> None:
     """Sleep for a small, human-like random delay."""
@@ -113,10 +128,14 @@ def human_delay() -> None:
 
 
 def with_human_delay(func: Callable[..., "T"]) -> Callable[..., "T"]:
-    """Decorator to add a human delay before and after the wrapped call."""
+    """
+    Decorator to add a human delay after the wrapped call.
+
+    There is no leading delay: the user has just issued the command, so
+    a pause before acting only adds latency.
+    """
 
     def _wrapper(*args, **kwargs):
-        human_delay()
         result = func(*args, **kwargs)
         human_delay()
         return result
@@ -188,6 +207,112 @@ class _SessionState:
     active_video: Optional[SearchResult] = None
     driver_ready: bool = False
     browser_closed: bool = False
+    player_handle: Optional[str] = None
+
+    # Lookup aids rebuilt whenever search_results changes
+    lower_titles: List[str] = field(default_factory=list)
+    token_index: Dict[str, Set[int]] = field(default_factory=dict)
+
+    def set_search_results(self, results: List[SearchResult]) -> None:
+        """Store results and pre-compute lowered titles and a token index."""
+        self.search_results = results
+        self.lower_titles = [r.title.lower() for r in results]
+        index: Dict[str, Set[int]] = defaultdict(set)
+        for i, title in enumerate(self.lower_titles):
+            for tok in title.split():
+                index[tok].add(i)
+        self.token_index = dict(index)
+
+
+# ==============================================================================
+# Pooled HTTP for pytube's InnerTube calls
+# ==============================================================================
+
+
+class _PooledResponse:
+    """The slice of the urlopen() response interface pytube reads from."""
+
+    def __init__(self, resp) -> None:
+        self._resp = resp
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        body = self._resp.content
+        return body if amt is None else body[:amt]
+
+    def info(self):
+        return self._resp.headers
+
+
+_pytube_execute_request = _pytube_request._execute_request
+_http_session = requests.Session() if requests is not None else None
+
+
+def _pooled_execute_request(url, method=None, headers=None, data=None,
+                            timeout=socket._GLOBAL_DEFAULT_TIMEOUT):
+    """
+    Drop-in for ``pytube.request._execute_request`` that sends InnerTube
+    POSTs (Search and friends) over one keep-alive session, so repeat
+    searches skip the TCP + TLS handshake.  Everything else, including
+    ranged stream downloads, still goes through pytube's urlopen path.
+    """
+    if method != "POST":
+        return _pytube_execute_request(url, method, headers, data, timeout)
+    if not url.lower().startswith("http"):
+        raise ValueError("Invalid URL")
+
+    base_headers = {"User-Agent": "Mozilla/5.0", "accept-language": "en-US,en"}
+    if headers:
+        base_headers.update(headers)
+    if data and not isinstance(data, bytes):
+        data = json.dumps(data).encode("utf-8")
+    resp = _http_session.post(
+        url,
+        headers=base_headers,
+        data=data,
+        timeout=timeout if isinstance(timeout, (int, float)) else None,
+    )
+    if resp.status_code >= 400:
+        # Same failure type urlopen() raises, so pytube's handling is unchanged
+        raise HTTPError(url, resp.status_code, resp.reason, resp.headers, None)
+    return _PooledResponse(resp)
+
+
+if _http_session is not None:
+    _pytube_request._execute_request = _pooled_execute_request
+
+
+# ==============================================================================
+# Search cache
+# ==============================================================================
+
+_search_cache: "OrderedDict[Tuple[str, int], Tuple[float, List[SearchResult]]]" = OrderedDict()
+_search_cache_lock = threading.Lock()
+
+
+def _search_cached(query: str, limit: int) -> List[SearchResult]:
+    """
+    Return the top ``limit`` results for ``query``, hitting YouTube at most
+    once per (query, limit) every ``_SEARCH_CACHE_TTL_SECS``.
+
+    Empty results and failures are not cached.
+    """
+    key = (query.strip().lower(), limit)
+    now = time.monotonic()
+    with _search_cache_lock:
+        entry = _search_cache.get(key)
+        if entry is not None and now - entry[0] < _SEARCH_CACHE_TTL_SECS:
+            _search_cache.move_to_end(key)
+            log.debug("Search cache hit for %r", query)
+            return list(entry[1])
+
+    results = [SearchResult.from_pytube(v) for v in Search(query).results[:limit]]
+    if results:
+        with _search_cache_lock:
+            _search_cache[key] = (now, results)
+            _search_cache.move_to_end(key)
+            while len(_search_cache) > _SEARCH_CACHE_SIZE:
+                _search_cache.popitem(last=False)
+    return list(results)
 
 
 # ==============================================================================
@@ -204,6 +329,7 @@ class _DriverFactory:
     """
 
     _driver: Optional[Chrome] = None
+    _driver_path: Optional[str] = None
     _lock = threading.RLock()
 
     @classmethod
@@ -216,24 +342,53 @@ class _DriverFactory:
                 log.info("Chrome WebDriver initialised")
             return cls._driver
 
+    @classmethod
+    def has_driver(cls) -> bool:
+        """Whether a driver is currently running (never creates one)."""
+        return cls._driver is not None
+
     # ------------------------------------------------------------------ #
     # Driver setup & teardown
     # ------------------------------------------------------------------ #
 
+    @classmethod
+    def _resolve_driver_path(cls) -> str:
+        """
+        Locate chromedriver once per process.
+
+        ``CHROMEDRIVER_PATH`` skips webdriver-manager's network/version check
+        entirely; otherwise the installed path is exported so child processes
+        reuse it.
+        """
+        if cls._driver_path is None:
+            path = os.environ.get("CHROMEDRIVER_PATH")
+            if not path:
+                path = ChromeDriverManager().install()
+                os.environ["CHROMEDRIVER_PATH"] = path
+            cls._driver_path = path
+        return cls._driver_path
+
     @classmethod
     def _create_driver(cls) -> Chrome:
         chrome_opts = ChromeOptions()
         chrome_opts.add_argument("--disable-infobars")
         chrome_opts.add_argument("--mute-audio")
         chrome_opts.add_argument("--disable-extensions")
+        chrome_opts.add_argument("--disable-gpu")
+        # Only the player matters; skip image decoding and notification prompts
+        chrome_opts.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_opts.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
         chrome_opts.add_experimental_option("excludeSwitches", ["enable-logging"])
 
         # Respect user-specified environment variables
         if os.getenv("HEADLESS", "0") == "1":
             chrome_opts.add_argument("--headless=new")
 
-        driver_path = ChromeDriverManager().install()
-        driver = Chrome(driver_path, options=chrome_opts)
+        service = ChromeService(executable_path=cls._resolve_driver_path())
+        driver = Chrome(service=service, options=chrome_opts)
         driver.set_page_load_timeout(_DEFAULT_TIMEOUT_SECS)
         return driver
 
@@ -256,7 +411,13 @@ class _DriverFactory:
 
 
 class _PlayerJS:
-    """Collection of JavaScript helpers executed in the browser context."""
+    """
+    Collection of JavaScript helpers executed in the browser context.
+
+    Every helper goes through :meth:`batch`, which runs a small dispatcher
+    over a list of ops so several player commands cost one WebDriver
+    round-trip instead of one each.
+    """
 
     # The HTML5 <video> tag used by YouTube
     VIDEO_QUERY = (
@@ -264,48 +425,107 @@ class _PlayerJS:
         "   || document.querySelector('video');"
     )
 
+    BATCH_SCRIPT = (
+        "const v = document.querySelector('video.html5-main-video')"
+        "   || document.querySelector('video');"
+        "return arguments[0].map(o => {"
+        "  switch (o) {"
+        "    case 'paused': return v ? v.paused : null;"
+        "    case 'play':   v && v.play(); return null;"
+        "    case 'pause':  v && v.pause(); return null;"
+        "    case 'toggle': v && (v.paused ? v.play() : v.pause()); return null;"
+        "    case 'next':   document.querySelector('.ytp-next-button')?.click(); return null;"
+        "    case 'prev':   document.querySelector('.ytp-prev-button')?.click(); return null;"
+        "    case 'ready':  return !!document.getElementById('movie_player');"
+        "  }"
+        "  return null;"
+        "});"
+    )
+
+    # Resolves true once #movie_player exists, or false after arguments[0] ms
+    WAIT_READY_SCRIPT = (
+        "const timeoutMs = arguments[0], cb = arguments[arguments.length - 1];"
+        "if (document.getElementById('movie_player')) return cb(true);"
+        "const mo = new MutationObserver(() => {"
+        "  if (document.getElementById('movie_player')) { mo.disconnect(); cb(true); }"
+        "});"
+        "mo.observe(document.documentElement, {childList: true, subtree: true});"
+        "setTimeout(() => { mo.disconnect(); cb(false); }, timeoutMs);"
+    )
+
+    @staticmethod
+    def batch(driver: Chrome, ops: Sequence[str]) -> List[Optional[bool]]:
+        """Run ``ops`` in order in one execute_script call; one result per op."""
+        return driver.execute_script(_PlayerJS.BATCH_SCRIPT, list(ops)) or []
+
+    @staticmethod
+    def _paused_state(was_paused: Optional[bool]) -> bool:
+        """``paused`` is null when the page has no <video> yet."""
+        if was_paused is None:
+            raise PlayerNotReadyError("No video element on the page")
+        return bool(was_paused)
+
     @staticmethod
     def is_video_paused(driver: Chrome) -> bool:
-        script = f"{_PlayerJS.VIDEO_QUERY}.paused;"
-        return bool(driver.execute_script(script))
+        return _PlayerJS._paused_state(_PlayerJS.batch(driver, ["paused"])[0])
 
     @staticmethod
     def play(driver: Chrome) -> None:
-        driver.execute_script(f"{_PlayerJS.VIDEO_QUERY}.play();")
+        _PlayerJS.batch(driver, ["play"])
 
     @staticmethod
     def pause(driver: Chrome) -> None:
-        driver.execute_script(f"{_PlayerJS.VIDEO_QUERY}.pause();")
+        _PlayerJS.batch(driver, ["pause"])
+
+    @staticmethod
+    def ensure_paused(driver: Chrome) -> bool:
+        """Pause if playing, in one round-trip; True if this call paused it."""
+        was_paused, _ = _PlayerJS.batch(driver, ["paused", "pause"])
+        return not _PlayerJS._paused_state(was_paused)
+
+    @staticmethod
+    def ensure_playing(driver: Chrome) -> bool:
+        """Play if paused, in one round-trip; True if this call resumed it."""
+        was_paused, _ = _PlayerJS.batch(driver, ["paused", "play"])
+        return _PlayerJS._paused_state(was_paused)
 
     @staticmethod
     def toggle_playback(driver: Chrome) -> None:
-        script = (
-            "const v = " + _PlayerJS.VIDEO_QUERY + ";"
-            "v.paused ? v.play() : v.pause();"
-        )
-        driver.execute_script(script)
+        _PlayerJS.batch(driver, ["toggle"])
 
     @staticmethod
     def go_to_next(driver: Chrome) -> None:
         # Works in playlists or when YouTube auto-queues
-        driver.execute_script(
-            "document.querySelector('.ytp-next-button')?.click();"
-        )
+        _PlayerJS.batch(driver, ["next"])
 
     @staticmethod
     def go_to_previous(driver: Chrome) -> None:
-        driver.execute_script(
-            "document.querySelector('.ytp-prev-button')?.click();"
-        )
+        _PlayerJS.batch(driver, ["prev"])
 
     @staticmethod
     def is_player_ready(driver: Chrome) -> bool:
         """Check if #movie_player has initialised enough to accept commands."""
-        ready_state_script = (
-            "return (typeof document.getElementById('movie_player') !== 'undefined')"
-            "       && !!document.getElementById('movie_player');"
-        )
-        return bool(driver.execute_script(ready_state_script))
+        return bool(_PlayerJS.batch(driver, ["ready"])[0])
+
+
+# ==============================================================================
+# Retry policy
+# ==============================================================================
+
+# Built once at import and shared by every decorated method
+_RETRY = retry(
+    retry=retry_if_exception_type(
+        (WebDriverException, JavascriptException, TimeoutException)
+    ),
+    wait=wait_exponential(multiplier=0.5, min=0.5, max=4.0),
+    stop=stop_after_attempt(4),
+    reraise=True,
+)
+
+
+def _retryable(func: Callable[..., "T"]) -> Callable[..., "T"]:
+    """Apply the shared retry policy plus the trailing human delay."""
+    return _RETRY(with_human_delay(func))
 
 
 # ==============================================================================
@@ -329,7 +549,7 @@ class YouTubeController:
     >>> yt.close_browser()
     """
 
-    _instance_lock = threading.RLock()
+    _instance_lock = threading.Lock()
 
     # ---------------------------------------------------------------------- #
     # Singleton instantiation (optional)
@@ -345,10 +565,14 @@ class YouTubeController:
     @classmethod
     def get_global(cls) -> "YouTubeController":
         """Return a lazily-created global instance of the controller."""
-        with cls._instance_lock:
-            if cls._global_instance is None:
-                cls._global_instance = YouTubeController()
-            return cls._global_instance
+        # Double-checked: only the very first call takes the lock
+        instance = cls._global_instance
+        if instance is None:
+            with cls._instance_lock:
+                if cls._global_instance is None:
+                    cls._global_instance = YouTubeController()
+                instance = cls._global_instance
+        return instance
 
     # ------------------------------------------------------------------ #
     # Construction / context-manager protocol
@@ -356,10 +580,13 @@ class YouTubeController:
 
     def __init__(self) -> None:
         self._state = _SessionState()
-        self._lock = threading.RLock()
-        self._executor = ThreadPoolExecutor(max_workers=1)
         log.debug("YouTubeController initialised")
 
+    @cached_property
+    def _executor(self) -> ThreadPoolExecutor:
+        """Worker for background tasks, created on first use only."""
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="yt")
+
     # .................................................................. #
     # Context manager helpers
     # .................................................................. #
@@ -375,7 +602,8 @@ class YouTubeController:
     ) -> Optional[bool]:
         # Always attempt to teardown without swallowing exceptions
         self.close_browser()
-        self._executor.shutdown(wait=False, cancel_futures=True)
+        if "_executor" in self.__dict__:
+            self._executor.shutdown(wait=False, cancel_futures=True)
         return None
 
     # ------------------------------------------------------------------ #
@@ -394,25 +622,44 @@ class YouTubeController:
         """
         log.info("Searching YouTube for query=%r, limit=%d …", query, limit)
         try:
-            yt_search = Search(query)
-            results = [SearchResult.from_pytube(v) for v in yt_search.results[:limit]]
+            results = _search_cached(query, limit)
         except Exception as exc:  # noqa: BLE001
-            log.error("pytube.Search failed: %s", exc, exc_info=True)
+            # The exception is re-raised to the caller; only pay for
+            # traceback formatting when debugging
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("pytube.Search failed", exc_info=True)
+            log.error("pytube.Search failed: %s", exc)
             speak("Sorry, there was a problem searching YouTube.")
             raise
         if not results:
             speak("I couldn't find any videos matching that search.")
             raise NoSearchResultsError(f"No results for query {query!r}")
 
-        self._state.search_results = results
+        self._state.set_search_results(results)
         # Build response
         response = "Here are the top results: " + ", ".join(
-            [f"Result {i+1}: {r.title}" for i, r in enumerate(results)]
+            f"Result {i}: {r.title}" for i, r in enumerate(results, 1)
         )
         speak(response)
         log.debug("Search results cached: %s", results)
         return results
 
+    def search_and_open(self, query: str, limit: int = 5) -> str:
+        """
+        Search YouTube and play the top result.
+
+        The WebDriver is started on the executor while the search runs on
+        the calling thread, so a cold start costs the slower of the two
+        rather than their sum.
+        """
+        driver_future = self._executor.submit(_DriverFactory.get_driver)
+        self.search(query, limit=limit)
+        try:
+            driver_future.result(timeout=_DEFAULT_TIMEOUT_SECS)
+        except FuturesTimeout:
+            raise PlayerNotReadyError("Timed-out starting the browser") from None
+        return self.play(1)
+
     # ------------------------------------------------------------------ #
     # Playback control
     # ------------------------------------------------------------------ #
@@ -442,9 +689,14 @@ class YouTubeController:
         target = self._resolve_video_identifier(video_identifier)
 
         log.info("Opening video: %s", target)
-        driver.execute_script(f"window.open('{target.watch_url}', '_blank');")
-        time.sleep(1)  # brief wait for tab to open
-        driver.switch_to.window(driver.window_handles[-1])
+        # Reuse one player tab rather than opening (and leaking) a tab per play
+        handle = self._state.player_handle
+        if handle is not None and handle in driver.window_handles:
+            if driver.current_window_handle != handle:
+                driver.switch_to.window(handle)
+        else:
+            self._state.player_handle = driver.current_window_handle
+        driver.get(target.watch_url)
 
         # Wait until player ready
         self._wait_for_player_ready(driver)
@@ -456,20 +708,18 @@ class YouTubeController:
     def pause(self) -> None:
         """Pause the currently playing video."""
         driver = self._get_driver_or_raise()
-        if _PlayerJS.is_video_paused(driver):
+        if not _PlayerJS.ensure_paused(driver):
             log.debug("Pause requested, but video already paused")
             return
-        _PlayerJS.pause(driver)
         speak("Video paused.")
 
     @_retryable
     def resume(self) -> None:
         """Resume playback if paused."""
         driver = self._get_driver_or_raise()
-        if not _PlayerJS.is_video_paused(driver):
+        if not _PlayerJS.ensure_playing(driver):
             log.debug("Resume requested, but video already playing")
             return
-        _PlayerJS.play(driver)
         speak("Resuming playback.")
 
     @_retryable
@@ -504,6 +754,8 @@ class YouTubeController:
             speak("There are no open tabs.")
             return
         log.info("Closing current tab: %s", driver.current_url)
+        if driver.current_window_handle == self._state.player_handle:
+            self._state.player_handle = None
         driver.close()
 
         # Switch back to previous tab if available
@@ -516,9 +768,12 @@ class YouTubeController:
     @_retryable
     def close_browser(self) -> None:
         """Close the browser entirely and reset state."""
-        driver = _DriverFactory.get_driver()  # may raise
-        log.info("Closing browser …")
-        driver.quit()
+        if self._state.browser_closed:
+            return
+        # Never cold-start Chrome just to quit it
+        if _DriverFactory.has_driver():
+            log.info("Closing browser …")
+            _DriverFactory.close_driver()
         self._state = _SessionState(browser_closed=True)
         speak("Browser closed.")
 
@@ -526,24 +781,6 @@ class YouTubeController:
     # Internal helpers
     # ------------------------------------------------------------------ #
 
-    @staticmethod
-    def _retry_decorator() -> Callable[[Callable[..., "T"]], Callable[..., "T"]]:
-        """Return a tenacity.retry decorator with sane defaults."""
-        return retry(
-            retry=retry_if_exception_type(
-                (WebDriverException, JavascriptException, TimeoutException)
-            ),
-            wait=wait_exponential(multiplier=0.5, min=0.5, max=4.0),
-            stop=stop_after_attempt(4),
-            reraise=True,
-        )
-
-    # Dynamically apply the decorator so that type hints remain intact
-    def _retryable(self, func: Callable[..., "T"]) -> Callable[..., "T"]:
-        return self._retry_decorator()(with_human_delay(func))
-
-    # ..................................................................
-
     def _get_driver_or_raise(self) -> Chrome:
         if self._state.browser_closed:
             raise BrowserClosedError("Browser has been closed.")
@@ -556,9 +793,19 @@ class YouTubeController:
                 raise VideoNotFoundError(f"Index {identifier} out of range.")
             return self._state.search_results[idx]
 
-        # Otherwise treat identifier as substring
+        # Otherwise treat identifier as substring; whole-word queries are
+        # narrowed via the token index before the substring check
+        query = identifier.lower()
+        tokens = query.split()
+        candidates = (
+            set.intersection(*(self._state.token_index.get(t, set()) for t in tokens))
+            if tokens else set()
+        )
+        titles = self._state.lower_titles
         matches = [
-            res for res in self._state.search_results if identifier.lower() in res.title.lower()
+            self._state.search_results[i]
+            for i in (sorted(candidates) or range(len(titles)))
+            if query in titles[i]
         ]
         if not matches:
             raise VideoNotFoundError(f"No search result matches {identifier!r}")
@@ -569,18 +816,18 @@ class YouTubeController:
 
     # ..................................................................
 
-    @_retry_decorator.__func__  # type: ignore[attr-defined]
+    @_RETRY
     def _wait_for_player_ready(self, driver: Chrome, timeout: int = 10) -> None:  # noqa: D401
         """Block until YouTube's #movie_player is ready or raise."""
         log.debug("Waiting for #movie_player …")
-        start = time.time()
-        while time.time() - start < timeout:
-            if _PlayerJS.is_player_ready(driver):
-                self._state.driver_ready = True
-                log.debug("YouTube player ready")
-                return
-            time.sleep(0.2)
-        raise PlayerNotReadyError("Timed-out waiting for movie_player")
+        # One async script that resolves as soon as the element appears,
+        # instead of polling is_player_ready every 200 ms
+        driver.set_script_timeout(timeout + 1)
+        ready = driver.execute_async_script(_PlayerJS.WAIT_READY_SCRIPT, int(timeout * 1000))
+        if not ready:
+            raise PlayerNotReadyError("Timed-out waiting for movie_player")
+        self._state.driver_ready = True
+        log.debug("YouTube player ready")
 
     # ------------------------------------------------------------------ #
     # Introspection / debug helpers
@@ -599,14 +846,6 @@ class YouTubeController:
         }
 
 
-# ==============================================================================
-# Decorator - we need to define it *after* YouTubeController so it has access
-# ==============================================================================
-def _retryable(func):  # type: ignore[override]
-    """Class method decorator stub (replaced dynamically)."""
-    return func  # placeholder; replaced per-instance
-
-
 # ==============================================================================
 # Example usage (guarded)
 # ==============================================================================
@@ -4,6 +4,7 @@ A clean, well-structured AI assistant that runs with: python app.py
 """
 
 import sys
+import socket
 import threading
 import webview
 import time
@@ -33,7 +34,10 @@ log.setLevel(logging.ERROR)
 # Initialize Flask app
 app = Flask(__name__, static_folder='static', template_folder='templates')
 app.config['SECRET_KEY'] = SECRET_KEY
-socketio = SocketIO(app, cors_allowed_origins="*")
+# Threading mode pinned: the server runs beside pywebview's GUI loop and the
+# audio stack (PyAudio, Porcupine, playback) blocks in C, which would stall an
+# eventlet/gevent hub if one were picked up by auto-detection
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode="threading")
 
 # Initialize assistant core
 assistant = AssistantCore(socketio)
@@ -43,8 +47,7 @@ class WebAPI:
 
     def start_assistant(self):
         """Start the assistant conversation"""
-        if not assistant.is_active:
-            threading.Thread(target=assistant.start_conversation, daemon=True).start()
+        if assistant.try_start():
             return "Assistant started"
         return "Assistant already active"
 
@@ -71,8 +74,7 @@ def index():
 # Socket events
 @socketio.on('start_assistant')
 def handle_start_assistant():
-    if not assistant.is_active:
-        threading.Thread(target=assistant.start_conversation, daemon=True).start()
+    if assistant.try_start():
         socketio.emit('assistant_status', {'status': 'started'})
 
 @socketio.on('stop_assistant')
@@ -92,6 +94,17 @@ def start_server():
     """Start the Flask server"""
     socketio.run(app, host=HOST, port=PORT, debug=False)
 
+def _wait_port(host, port, timeout=5.0):
+    """Poll until a TCP connect to host:port succeeds; False on timeout"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.1):
+                return True
+        except OSError:
+            time.sleep(0.02)
+    return False
+
 def main():
     """Main application entry point"""
     print("Starting Nirvan AI Assistant...")
@@ -100,8 +113,9 @@ def main():
     server_thread = threading.Thread(target=start_server, daemon=True)
     server_thread.start()
 
-    # Give server time to start
-    time.sleep(2)
+    # Wait until the server is accepting connections
+    if not _wait_port('127.0.0.1', PORT):
+        logging.warning(f"Server not reachable on port {PORT} yet; opening window anyway")
 
     # Create webview window
     api = WebAPI()
@@ -120,13 +134,9 @@ def main():
     )
     api.window = window
 
-    # Start wake word detector
-    wake_thread = threading.Thread(
-        target=run_wake_word_detector, 
-        args=(socketio,), 
-        daemon=True
-    )
-    wake_thread.start()
+    # Start wake word detector on Socket.IO's scheduler so its emits go
+    # through the same async mode as the server
+    socketio.start_background_task(run_wake_word_detector, socketio)
 
     print("Nirvan Assistant is ready!")
     print("Say 'Nirvan' to activate or click the window.")
@@ -3,55 +3,86 @@
 Nirvan Assistant Core - Main conversation and control logic
 """
 
+import re
 import time
 import logging
 import threading
-from enum import Enum, auto
 from typing import Optional
 
 from speech_handler import SpeechHandler
+from ui_emitter import CoalescingEmitter
 from command_processor import CommandProcessor
+from config import AssistantState
 
 logger = logging.getLogger(__name__)
 
-class AssistantState(Enum):
-    """Assistant operational states"""
-    IDLE = auto()
-    LISTENING = auto()
-    THINKING = auto()
-    SPEAKING = auto()
-    ERROR = auto()
+# Phrases that end the conversation, matched as whole words in one pass
+_EXIT_RE = re.compile(r"\b(?:goodbye|exit|close|that'?s all|quit|stop)\b", re.IGNORECASE)
+
+# Fixed utterances, synthesized once at startup so speaking them is playback only
+_GREETING = "Hello! How can I help you today?"
+_AUDIO_TROUBLE = "I'm having trouble with the audio system. Please check your microphone."
+_INACTIVE = "Closing due to inactivity. Just say my name to start again."
+_GOODBYE = "Goodbye! Have a great day."
+_ANYTHING_ELSE = "Is there anything else I can help you with?"
+_LET_ME_KNOW = "Let me know if there's anything else you need."
+_CANT_HEAR = "I'm having trouble hearing you. I'll wait for you to call me again."
+_REPEAT = "Sorry, I didn't catch that. Could you please repeat?"
+_STATIC_PHRASES = (_GREETING, _AUDIO_TROUBLE, _INACTIVE, _GOODBYE, _ANYTHING_ELSE, _LET_ME_KNOW, _CANT_HEAR, _REPEAT)
 
 class AssistantCore:
     """Main assistant logic coordinator"""
     
     def __init__(self, socketio):
         self.socketio = socketio
+        # Rapid state transitions collapse to the latest one per 20 ms window
+        self.state_emitter = CoalescingEmitter(socketio, interval=0.02)
         self.speech_handler = SpeechHandler(socketio)
         self.command_processor = CommandProcessor(socketio)
         
         self.state = AssistantState.IDLE
         self.is_active = False
+        self._start_lock = threading.Lock()
         self.conversation_timeout = 60  # seconds
         self.last_interaction = time.time()
         self.max_listen_retries = 3
         
+        for phrase in _STATIC_PHRASES:
+            self.speech_handler.prefetch(phrase)
+        
         logger.info("Assistant core initialized")
     
-    def update_state(self, new_state: AssistantState):
-        """Update assistant state and notify UI"""
+    def update_state(self, new_state: str):
+        """Update assistant state (an AssistantState value) and notify UI"""
         if self.state != new_state:
             self.state = new_state
-            self.socketio.emit('state_change', {'state': new_state.name.lower()})
-            logger.info(f"State changed to: {new_state.name}")
+            self.state_emitter.emit('state_change', {'state': new_state})
+            logger.info(f"State changed to: {new_state}")
     
+    def _claim(self) -> bool:
+        """Atomically mark the conversation active; False if it already was"""
+        with self._start_lock:
+            if self.is_active:
+                return False
+            self.is_active = True
+            return True
+
+    def try_start(self) -> bool:
+        """Start a conversation in the background unless one is already running"""
+        if not self._claim():
+            return False
+        self.socketio.start_background_task(self._run_conversation)
+        return True
+
     def start_conversation(self):
         """Start a new conversation session"""
-        if self.is_active:
+        if not self._claim():
             logger.warning("Conversation already active")
             return
-        
-        self.is_active = True
+        self._run_conversation()
+
+    def _run_conversation(self):
+        """Conversation body; the caller has already claimed is_active"""
         self.last_interaction = time.time()
         
         logger.info("Starting conversation")
@@ -59,12 +90,12 @@ class AssistantCore:
         
         # Test audio system first
         if not self.speech_handler.test_audio_system():
-            self.speech_handler.speak("I'm having trouble with the audio system. Please check your microphone.")
+            self.speech_handler.speak(_AUDIO_TROUBLE)
             self.stop_conversation()
             return
         
         # Welcome message
-        self.speech_handler.speak("Hello! How can I help you today?")
+        self.speech_handler.speak(_GREETING)
         self.update_state(AssistantState.IDLE)
         
         # Main conversation loop
@@ -84,7 +115,7 @@ class AssistantCore:
         while self.is_active:
             # Check for timeout
             if time.time() - self.last_interaction > self.conversation_timeout:
-                self.speech_handler.speak("Closing due to inactivity. Just say my name to start again.")
+                self.speech_handler.speak(_INACTIVE)
                 break
             
             # Listen for command
@@ -96,9 +127,8 @@ class AssistantCore:
                 self.last_interaction = time.time()
                 
                 # Check for exit commands
-                exit_phrases = ["goodbye", "exit", "close", "that's all", "quit", "stop"]
-                if any(phrase in command.lower() for phrase in exit_phrases):
-                    self.speech_handler.speak("Goodbye! Have a great day.")
+                if _EXIT_RE.search(command):
+                    self.speech_handler.speak(_GOODBYE)
                     break
                 
                 # Process the command
@@ -108,19 +138,19 @@ class AssistantCore:
                 # Provide feedback
                 self.update_state(AssistantState.SPEAKING)
                 if success:
-                    self.speech_handler.speak("Is there anything else I can help you with?")
+                    self.speech_handler.speak(_ANYTHING_ELSE)
                 else:
-                    self.speech_handler.speak("Let me know if there's anything else you need.")
+                    self.speech_handler.speak(_LET_ME_KNOW)
                 
                 self.update_state(AssistantState.IDLE)
             
             else:
                 listen_failures += 1
                 if listen_failures >= self.max_listen_retries:
-                    self.speech_handler.speak("I'm having trouble hearing you. I'll wait for you to call me again.")
+                    self.speech_handler.speak(_CANT_HEAR)
                     break
                 else:
-                    self.speech_handler.speak("Sorry, I didn't catch that. Could you please repeat?")
+                    self.speech_handler.speak(_REPEAT)
         
         # End conversation
         self.stop_conversation()
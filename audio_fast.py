@@ -0,0 +1,85 @@
+"""
+Audio Fast - Native-speed PCM helpers for the recognition path
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+def _trim_and_downsample_loop(pcm, sr_in, sr_out, rms_thresh, pad_frames):
+    """
+    Trim leading/trailing silence (10 ms frames below rms_thresh, keeping
+    pad_frames either side of speech) and linearly resample to sr_out if lower.
+    Written as plain loops so numba can compile and vectorize it.
+    """
+    frame = sr_in // 100
+    n_frames = pcm.shape[0] // frame
+    thresh_sq = rms_thresh * rms_thresh
+    first = -1
+    last = -1
+    for f in range(n_frames):
+        acc = 0.0
+        base = f * frame
+        for i in range(frame):
+            x = float(pcm[base + i])
+            acc += x * x
+        if acc / frame >= thresh_sq:
+            if first < 0:
+                first = f
+            last = f
+    if first < 0:
+        return pcm[:0].copy()
+
+    start = max(0, first - pad_frames) * frame
+    end = min(pcm.shape[0], (last + 1 + pad_frames) * frame)
+    seg = pcm[start:end]
+    if sr_out >= sr_in:
+        return seg.copy()
+
+    n_out = int(seg.shape[0] * sr_out / sr_in)
+    out = np.empty(n_out, dtype=np.int16)
+    step = sr_in / sr_out
+    for j in range(n_out):
+        pos = j * step
+        i0 = int(pos)
+        frac = pos - i0
+        i1 = i0 + 1 if i0 + 1 < seg.shape[0] else i0
+        out[j] = np.int16(seg[i0] * (1.0 - frac) + seg[i1] * frac)
+    return out
+
+def _trim_and_downsample_numpy(pcm, sr_in, sr_out, rms_thresh, pad_frames):
+    """Vectorized numpy equivalent used when numba isn't installed"""
+    frame = sr_in // 100
+    n_frames = pcm.shape[0] // frame
+    if n_frames == 0:
+        return pcm[:0].copy()
+    frames = pcm[:n_frames * frame].astype(np.float64).reshape(n_frames, frame)
+    voiced = np.flatnonzero((frames * frames).mean(axis=1) >= rms_thresh * rms_thresh)
+    if voiced.size == 0:
+        return pcm[:0].copy()
+
+    start = max(0, int(voiced[0]) - pad_frames) * frame
+    end = min(pcm.shape[0], (int(voiced[-1]) + 1 + pad_frames) * frame)
+    seg = pcm[start:end]
+    if sr_out >= sr_in:
+        return seg.copy()
+
+    n_out = int(seg.shape[0] * sr_out / sr_in)
+    positions = np.arange(n_out) * (sr_in / sr_out)
+    return np.interp(positions, np.arange(seg.shape[0]), seg).astype(np.int16)
+
+if numba is not None:
+    _trim_and_downsample = numba.njit(cache=True, fastmath=True)(_trim_and_downsample_loop)
+else:
+    _trim_and_downsample = _trim_and_downsample_numpy
+
+def trim_and_downsample(pcm: np.ndarray, sr_in: int, sr_out: int,
+                        rms_thresh: float, pad_frames: int = 30) -> np.ndarray:
+    """
+    Trim silence from int16 mono PCM and resample it down to sr_out.
+    Returns an empty array when no frame reaches rms_thresh.
+    """
+    return _trim_and_downsample(pcm, sr_in, sr_out, float(rms_thresh), pad_frames)
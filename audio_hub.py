@@ -0,0 +1,233 @@
+"""
+Audio Hub - One long-lived microphone stream shared by every audio consumer
+"""
+
+import queue
+import threading
+import logging
+from typing import List, Optional
+
+import pyaudio
+import speech_recognition as sr
+
+from config import AUDIO_DEVICE_INDEX, SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+FRAME_SAMPLES = 512  # Porcupine's frame length at 16 kHz
+SAMPLE_WIDTH = 2     # int16
+_SUBSCRIBER_BACKLOG = 200  # frames (~6 s) a slow consumer may fall behind before old audio is dropped
+_READ_TIMEOUT = 2.0  # seconds without a frame before a reader gives up
+
+class Subscription:
+    """A consumer's view of the hub: a bounded queue of raw int16 frames"""
+
+    def __init__(self, hub: "AudioHub"):
+        self._hub = hub
+        self._frames = queue.Queue(maxsize=_SUBSCRIBER_BACKLOG)
+        self._buffer = bytearray()
+
+    def _push(self, frame: bytes):
+        try:
+            self._frames.put_nowait(frame)
+        except queue.Full:
+            # Never block the reader on a slow consumer; drop its oldest audio
+            try:
+                self._frames.get_nowait()
+            except queue.Empty:
+                pass
+            self._frames.put_nowait(frame)
+
+    def read(self, n_bytes: int) -> bytes:
+        """Block until n_bytes of audio are available and return them"""
+        while len(self._buffer) < n_bytes:
+            try:
+                self._buffer += self._frames.get(timeout=_READ_TIMEOUT)
+            except queue.Empty:
+                raise IOError("No audio from the microphone stream") from None
+        data = bytes(self._buffer[:n_bytes])
+        del self._buffer[:n_bytes]
+        return data
+
+    def close(self):
+        self._hub.unsubscribe(self)
+
+class AudioHub:
+    """
+    Owns a single PyAudio input stream. A reader thread fans every frame out
+    to the current subscribers, so the wake word detector and command
+    listening share the device instead of each opening their own.
+    """
+
+    def __init__(self, device_index: Optional[int] = AUDIO_DEVICE_INDEX, sample_rate: int = SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self._device_index = device_index
+        self._subscribers: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._pa = None
+        self._stream = None
+        self._thread = None
+
+    def start(self):
+        """Open the stream and start the reader thread (idempotent)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._pa = pyaudio.PyAudio()
+            try:
+                self._stream = self._pa.open(
+                    rate=self.sample_rate, channels=1, format=pyaudio.paInt16,
+                    input=True, frames_per_buffer=FRAME_SAMPLES,
+                    input_device_index=self._device_index
+                )
+            except Exception:
+                self._pa.terminate()
+                self._pa = None
+                raise
+            self._thread = threading.Thread(target=self._reader, name="audio-hub", daemon=True)
+            self._thread.start()
+        logger.info("Audio hub started")
+
+    def _reader(self):
+        """Blocking reads from PortAudio, copied to every subscriber"""
+        try:
+            while True:
+                frame = self._stream.read(FRAME_SAMPLES, exception_on_overflow=False)
+                with self._lock:
+                    subscribers = list(self._subscribers)
+                for sub in subscribers:
+                    sub._push(frame)
+        except Exception as e:
+            logger.error(f"Audio hub stream failed: {e}")
+            self._close_stream()
+
+    def _close_stream(self):
+        """Release the device so the next subscribe() reopens it"""
+        with self._lock:
+            stream, pa = self._stream, self._pa
+            self._stream = self._pa = self._thread = None
+        try:
+            if stream is not None:
+                stream.close()
+        except Exception as e:
+            logger.debug(f"Closing audio hub stream failed: {e}")
+        if pa is not None:
+            pa.terminate()
+
+    def subscribe(self) -> Subscription:
+        """Start receiving frames from now on"""
+        self.start()
+        sub = Subscription(self)
+        with self._lock:
+            self._subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+
+class _FrameStream:
+    """
+    The stream speech_recognition reads from: like PyAudio's, read() takes a
+    count of audio frames (samples), not bytes, which is what the recognizer
+    assumes when it turns CHUNK into seconds
+    """
+
+    def __init__(self, sub: Subscription):
+        self._sub = sub
+
+    def read(self, frames: int) -> bytes:
+        return self._sub.read(frames * SAMPLE_WIDTH)
+
+    def close(self):
+        self._sub.close()
+
+class HubMicrophone(sr.AudioSource):
+    """
+    speech_recognition source backed by the hub: entering it subscribes
+    (so only audio from that point on is heard), leaving it unsubscribes.
+    No device is opened or closed per utterance.
+    """
+
+    def __init__(self, hub: AudioHub, chunk_size: int = 1024):
+        self.hub = hub
+        self.SAMPLE_RATE = hub.sample_rate
+        self.SAMPLE_WIDTH = SAMPLE_WIDTH
+        self.CHUNK = chunk_size
+        self.format = pyaudio.paInt16
+        self.stream = None
+
+    def __enter__(self):
+        assert self.stream is None, "This audio source is already inside a context manager"
+        self.stream = _FrameStream(self.hub.subscribe())
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self.stream.close()
+        finally:
+            self.stream = None
+
+_hub = None
+_hub_lock = threading.Lock()
+
+def get_audio_hub() -> AudioHub:
+    """The process-wide hub, created on first use"""
+    global _hub
+    with _hub_lock:
+        if _hub is None:
+            _hub = AudioHub()
+        return _hub
+
+# ——————————————————————————————————————————————————————————————————————————————
+# Unit‑test stubs (using pytest)
+# ——————————————————————————————————————————————————————————————————————————————
+
+class _FakeHub:
+    sample_rate = 16000
+
+    def __init__(self):
+        self.subs = []
+
+    def subscribe(self):
+        sub = Subscription(self)
+        self.subs.append(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        self.subs.remove(sub)
+
+def test_hub_microphone_reads_frames_not_bytes():
+    hub = _FakeHub()
+    mic = HubMicrophone(hub, chunk_size=1024)
+    with mic as source:
+        n_frames = 4
+        for _ in range(n_frames):
+            hub.subs[0]._push(bytes(FRAME_SAMPLES * SAMPLE_WIDTH))
+        data = source.stream.read(source.CHUNK)
+        # CHUNK frames of int16 audio, i.e. the CHUNK / SAMPLE_RATE seconds the recognizer counts
+        assert len(data) == source.CHUNK * SAMPLE_WIDTH
+        assert len(data) == n_frames // 2 * FRAME_SAMPLES * SAMPLE_WIDTH
+    assert hub.subs == []
+
+class _FailingStream:
+    def read(self, *args, **kwargs):
+        raise IOError("device unplugged")
+
+    def close(self):
+        pass
+
+class _FakePyAudio:
+    terminated = False
+
+    def terminate(self):
+        self.terminated = True
+
+def test_reader_failure_lets_subscribe_reopen():
+    hub = AudioHub(device_index=None)
+    pa = _FakePyAudio()
+    hub._pa, hub._stream, hub._thread = pa, _FailingStream(), object()
+    hub._reader()
+    assert pa.terminated
+    assert (hub._pa, hub._stream, hub._thread) == (None, None, None)
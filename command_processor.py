@@ -3,32 +3,106 @@
 Command Processor - Handles command interpretation and action execution
 """
 
+import re
 import logging
+from collections import deque
+from functools import lru_cache
 from typing import Dict, Callable, Any, Optional
 
+# Optional local embedder for the semantic command cache
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+from config import SEMANTIC_CACHE_MODEL, SEMANTIC_CACHE_THRESHOLD, SEMANTIC_CACHE_SIZE
 from gemini_core import process_command_with_gemini
-from actions.system_actions import open_application, search_web
+from actions.system_actions import open_application, search_web, SUPPORTED_APPS
 from actions.youtube_actions import search_youtube, play_video
 from actions.email_actions import send_email
 
 logger = logging.getLogger(__name__)
 
+# Local fast path: unambiguous phrasings of the common intents are resolved
+# with anchored patterns and dispatched without a Gemini round-trip. Order
+# matters (YouTube searches before generic web searches); anything that
+# doesn't match one of these in full, or chains several steps, still goes to
+# Gemini.
+_COMPOUND_RE = re.compile(r"\b(?:and|then)\b")
+_APP_NAMES = "|".join(re.escape(name) for name in sorted(SUPPORTED_APPS, key=len, reverse=True))
+_ORDINALS = {"first": "1", "second": "2", "third": "3", "fourth": "4", "fifth": "5"}
+_FAST_PATHS = [
+    ("search_youtube", re.compile(r"(?:search|look up|find)\s+(?:on\s+)?youtube\s+for\s+(?P<query>.+)")),
+    ("search_youtube", re.compile(r"(?:search|look up|find)\s+(?:for\s+)?(?P<query>.+?)\s+on\s+youtube")),
+    ("search_web", re.compile(r"(?:search|look up)\s+(?:the\s+web\s+|google\s+)?for\s+(?P<query>.+)")),
+    ("search_web", re.compile(r"google\s+(?P<query>.+)")),
+    ("play_video", re.compile(
+        r"play\s+(?:the\s+)?(?:(?:video|result|number)\s+)?"
+        r"(?P<video_identifier>\d+|first|second|third|fourth|fifth)(?:\s+(?:video|one|result))?"
+    )),
+    ("send_email", re.compile(
+        r"(?:send\s+)?(?:an\s+)?e-?mail\s+(?:to\s+)?(?P<recipient>[\w.@-]+)"
+        r"(?:\s+(?:about|regarding)\s+(?P<subject>.+))?"
+    )),
+    ("open_app", re.compile(
+        rf"(?:open|launch)\s+(?:the\s+)?(?P<app_name>{_APP_NAMES})(?:\s+app(?:lication)?)?"
+    )),
+]
+
+def _match_fast_path(command_text: str) -> Optional[Dict[str, Any]]:
+    """action_details for a command one of the local patterns fully matches, else None"""
+    text = " ".join(command_text.lower().split()).rstrip(".!?")
+    if text.startswith("please "):
+        text = text[7:]
+    if _COMPOUND_RE.search(text):
+        return None
+    for command, pattern in _FAST_PATHS:
+        match = pattern.fullmatch(text)
+        if match:
+            parameters = {k: v for k, v in match.groupdict().items() if v}
+            if command == "play_video":
+                ident = parameters["video_identifier"]
+                parameters["video_identifier"] = _ORDINALS.get(ident, ident)
+            if command == "send_email":
+                parameters.setdefault("subject", "")
+            return {"command": command, "parameters": parameters}
+    return None
+
+# Words that can differ between two phrasings of the same request
+_FILLER_WORDS = frozenset({"a", "an", "the", "please", "to", "for", "about", "on", "me", "my",
+                           "can", "could", "would", "you", "hey", "now", "just"})
+
+def _tokens(text: str) -> list:
+    return re.findall(r"[\w']+", text.lower())
+
+def _contains_run(tokens: list, run: list) -> bool:
+    """Whether run occurs as a contiguous sequence of tokens"""
+    n = len(run)
+    return any(tokens[i:i + n] == run for i in range(len(tokens) - n + 1)) if n else True
+
+@lru_cache(maxsize=None)
+def _embedder():
+    """Load the sentence embedder once; None if unavailable"""
+    if SentenceTransformer is None:
+        return None
+    try:
+        return SentenceTransformer(SEMANTIC_CACHE_MODEL)
+    except Exception as e:
+        logger.warning(f"Semantic cache disabled, could not load embedder: {e}")
+        return None
+
 class CommandProcessor:
     """Processes voice commands and executes appropriate actions"""
     
     def __init__(self, socketio):
         self.socketio = socketio
-        
-        # Map of available commands to their handler functions
-        self.action_handlers: Dict[str, Callable] = {
-            "open_app": self._handle_open_app,
-            "search_web": self._handle_search_web,
-            "search_youtube": self._handle_search_youtube,
-            "play_video": self._handle_play_video,
-            "send_email": self._handle_send_email,
-            "unsupported": self._handle_unsupported
-        }
-        
+        # Recent (unit-norm embedding, utterance tokens, action_details), oldest evicted first
+        self._sem_cache = deque(maxlen=SEMANTIC_CACHE_SIZE)
+        self._sem_matrix = None  # stacked embeddings, rebuilt after inserts
         logger.info("Command processor initialized")
     
     def process_command(self, command_text: str) -> bool:
@@ -36,12 +110,19 @@ class CommandProcessor:
         try:
             logger.info(f"Processing command: '{command_text}'")
             
-            # Use Gemini to interpret the command
-            action_details = process_command_with_gemini(command_text)
-            
-            if not action_details:
-                logger.warning("No action details returned from Gemini")
-                return False
+            # Clear-cut phrasings are handled locally; otherwise reuse the
+            # interpretation of a near-identical recent phrasing, or ask Gemini
+            action_details = _match_fast_path(command_text)
+            embedding = None
+            if action_details is None:
+                embedding = self._embed(command_text)
+                action_details = self._semantic_lookup(embedding, command_text)
+            if action_details is None:
+                action_details = process_command_with_gemini(command_text)
+                if not action_details:
+                    logger.warning("No action details returned from Gemini")
+                    return False
+                self._semantic_store(embedding, command_text, action_details)
             
             command_name = action_details.get("command")
             parameters = action_details.get("parameters", {})
@@ -49,9 +130,9 @@ class CommandProcessor:
             logger.info(f"Interpreted as: {command_name} with params: {parameters}")
             
             # Execute the appropriate handler
-            handler = self.action_handlers.get(command_name)
+            handler = _ACTION_HANDLERS.get(command_name)
             if handler:
-                return handler(parameters)
+                return handler(self, parameters)
             else:
                 logger.warning(f"No handler found for command: {command_name}")
                 return False
@@ -60,6 +141,51 @@ class CommandProcessor:
             logger.error(f"Command processing error: {e}")
             return False
     
+    def _embed(self, command_text: str):
+        """Unit-norm embedding of the utterance, or None without an embedder"""
+        model = _embedder()
+        if model is None:
+            return None
+        try:
+            return model.encode(command_text.strip().lower(), normalize_embeddings=True)
+        except Exception as e:
+            logger.error(f"Embedding failed: {e}")
+            return None
+    
+    def _semantic_lookup(self, embedding, command_text: str) -> Optional[Dict[str, Any]]:
+        """
+        A copy of the cached action_details for the most similar recent command,
+        if close enough. Phrasings that differ only in a slot ("email john
+        smith" / "email jane smith") embed almost identically, so a hit is only
+        reused when every cached parameter value appears word for word in this
+        utterance and the utterance says nothing the cached one didn't.
+        """
+        if embedding is None or not self._sem_cache:
+            return None
+        if self._sem_matrix is None:
+            self._sem_matrix = np.stack([emb for emb, _, _ in self._sem_cache])
+        scores = self._sem_matrix @ embedding
+        best = int(scores.argmax())
+        if scores[best] < SEMANTIC_CACHE_THRESHOLD:
+            return None
+        _, cached_tokens, cached = self._sem_cache[best]
+        tokens = _tokens(command_text)
+        parameters = cached.get("parameters") or {}
+        if (any(not _contains_run(tokens, _tokens(str(value))) for value in parameters.values() if value)
+                or set(tokens) - set(cached_tokens) - _FILLER_WORDS):
+            logger.debug("Semantic cache hit with different parameters, asking Gemini")
+            return None
+        logger.info(f"Semantic cache hit (similarity {scores[best]:.3f})")
+        return {"command": cached.get("command"), "parameters": dict(parameters)}
+    
+    def _semantic_store(self, embedding, command_text: str, action_details: Dict[str, Any]) -> None:
+        """Remember an interpretation worth reusing"""
+        command_name = action_details.get("command")
+        if embedding is None or command_name == "unsupported" or command_name not in _ACTION_HANDLERS:
+            return
+        self._sem_cache.append((embedding, _tokens(command_text), action_details))
+        self._sem_matrix = None
+    
     def _handle_open_app(self, params: Dict[str, Any]) -> bool:
         """Handle application opening requests"""
         try:
@@ -126,3 +252,59 @@ class CommandProcessor:
         reason = params.get("reason", "I'm not sure how to help with that.")
         logger.info(f"Unsupported command: {reason}")
         return False
+
+# Map of available commands to their handler functions, built once at import
+_ACTION_HANDLERS: Dict[str, Callable[[CommandProcessor, Dict[str, Any]], bool]] = {
+    "open_app": CommandProcessor._handle_open_app,
+    "search_web": CommandProcessor._handle_search_web,
+    "search_youtube": CommandProcessor._handle_search_youtube,
+    "play_video": CommandProcessor._handle_play_video,
+    "send_email": CommandProcessor._handle_send_email,
+    "unsupported": CommandProcessor._handle_unsupported
+}
+
+# ——————————————————————————————————————————————————————————————————————————————
+# Unit‑test stubs (using pytest)
+# ——————————————————————————————————————————————————————————————————————————————
+
+def test_semantic_cache_requires_matching_slots():
+    processor = CommandProcessor(None)
+    embedding = np.array([1.0, 0.0])
+    cached = {"command": "send_email", "parameters": {"recipient": "john smith", "subject": "the meeting"}}
+    processor._semantic_store(embedding, "email john smith about the meeting", cached)
+
+    # Same shape, different recipient: must not replay john's email
+    assert processor._semantic_lookup(embedding, "send an email to jane smith about the meeting") is None
+
+    hit = processor._semantic_lookup(embedding, "Email John Smith about the meeting please")
+    assert hit == cached and hit is not cached
+    hit["parameters"]["recipient"] = "someone else"
+    assert cached["parameters"]["recipient"] == "john smith"
+
+    processor = CommandProcessor(None)
+    processor._semantic_store(embedding, "play video 1", {"command": "play_video", "parameters": {"video_identifier": "1"}})
+    processor._semantic_store(np.array([0.0, 1.0]), "search for cats", {"command": "search_web", "parameters": {"query": "cats"}})
+    assert processor._semantic_lookup(embedding, "play video 1")["parameters"] == {"video_identifier": "1"}
+    assert processor._semantic_lookup(embedding, "play video 11") is None
+    assert processor._semantic_lookup(np.array([0.0, 1.0]), "search for cats and dogs") is None
+
+def test_fast_path_matches_clear_commands():
+    assert _match_fast_path("Open the Spotify app.") == {"command": "open_app", "parameters": {"app_name": "spotify"}}
+    assert _match_fast_path("launch chrome")["parameters"] == {"app_name": "chrome"}
+    assert _match_fast_path("search youtube for lofi beats") == {
+        "command": "search_youtube", "parameters": {"query": "lofi beats"}
+    }
+    assert _match_fast_path("play the second video")["parameters"] == {"video_identifier": "2"}
+
+def test_fast_path_leaves_ambiguous_commands_to_gemini():
+    for text in (
+        "start over",
+        "start recording",
+        "start chrome",
+        "open it",
+        "open the door",
+        "open my documents",
+        "search for python tutorials on youtube and play the first one",
+        "open chrome then search for cats",
+    ):
+        assert _match_fast_path(text) is None, text
@@ -23,6 +23,15 @@ CONVERSATION_TIMEOUT = 300  # 5 minutes
 AUDIO_DEVICE_INDEX = None  # Auto-detect
 SAMPLE_RATE = 16000
 
+# Text-to-speech engine: "pyttsx3" (offline), "piper" (offline) or "gtts" (network)
+TTS_ENGINE = os.getenv("NIRVAN_TTS", "pyttsx3").lower()
+PIPER_VOICE_PATH = os.getenv("PIPER_VOICE_PATH", "")
+
+# Speech recognition engine: "google" (network) or "whisper" (offline, faster-whisper int8 on CPU)
+ASR_ENGINE = os.getenv("NIRVAN_ASR", "google").lower()
+WHISPER_MODEL_SIZE = os.getenv("NIRVAN_WHISPER_MODEL", "small.en")  # English-only weights; recognition is English
+WHISPER_COMPUTE_TYPE = os.getenv("NIRVAN_WHISPER_COMPUTE", "int8")  # CTranslate2 quantization, e.g. int8, int8_float32, float32
+
 # Wake word detection
 WAKE_WORD_MODEL_PATH = "Nirvan_windows.ppn"
 WAKE_WORD_SENSITIVITY = 0.5
@@ -32,6 +41,11 @@ GEMINI_MODEL = "gemini-1.5-flash"
 GEMINI_TEMPERATURE = 0.7
 GEMINI_MAX_TOKENS = 1000
 
+# Semantic command cache (needs sentence-transformers; disabled if missing)
+SEMANTIC_CACHE_MODEL = os.getenv("NIRVAN_EMBED_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+SEMANTIC_CACHE_THRESHOLD = 0.92  # cosine similarity needed to reuse an interpretation
+SEMANTIC_CACHE_SIZE = 256
+
 # Email configuration (optional - set via environment variables)
 EMAIL_ADDRESS = os.getenv("EMAIL_ADDRESS", "")
 EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD", "")
@@ -54,19 +68,11 @@ WINDOW_HEIGHT = 620
 WINDOW_RESIZABLE = False
 WINDOW_MINIMIZED = True
 
-# UI States
-UI_STATES = {
-    "WAITING": "waiting",
-    "LISTENING": "listening", 
-    "THINKING": "thinking",
-    "SPEAKING": "speaking"
-}
-
-# Assistant states
+# Assistant states, sent to the UI as-is in 'state_change' events
 class AssistantState:
     IDLE = "idle"
     LISTENING = "listening"
-    PROCESSING = "processing"
+    THINKING = "thinking"
     SPEAKING = "speaking"
     ERROR = "error"
 
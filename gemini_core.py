@@ -4,6 +4,10 @@
 
 import os
 import json
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
 import google.generativeai as genai
 
 # --- Configure Gemini API ---
@@ -13,31 +17,188 @@ except (AttributeError, KeyError):
     print("FATAL ERROR: GEMINI_API_KEY environment variable not found.")
     exit()
 
+# Static instructions, kept byte-identical across calls so Gemini's implicit
+# prefix cache can reuse them; only the short user turn changes per request.
+# The output shape is enforced by the response schema, so the prompt only
+# has to say what each command means.
+_SYSTEM_PROMPT = """
+You are the intelligent core of a Windows desktop AI assistant.
+Map the user's command to one of the available commands and fill in its parameters.
+
+open_app: app_name
+search_web: query
+search_youtube: query
+play_video: video_identifier (partial title or position)
+send_email: recipient, subject
+exit: no parameters
+unsupported: reason (short explanation)
+"""
+
+_COMMANDS = ("open_app", "search_web", "search_youtube", "play_video", "send_email", "exit", "unsupported")
+_PARAMETERS = ("app_name", "query", "video_identifier", "recipient", "subject", "reason")
+
+_Type = genai.protos.Type
+_RESPONSE_SCHEMA = genai.protos.Schema(
+    type=_Type.OBJECT,
+    properties={
+        "command": genai.protos.Schema(type=_Type.STRING, format="enum", enum=list(_COMMANDS)),
+        "parameters": genai.protos.Schema(
+            type=_Type.OBJECT,
+            properties={name: genai.protos.Schema(type=_Type.STRING) for name in _PARAMETERS},
+        ),
+    },
+    required=["command", "parameters"],
+)
+
+_MODEL = genai.GenerativeModel(
+    'gemini-2.0-flash',
+    system_instruction=_SYSTEM_PROMPT,
+    generation_config=genai.GenerationConfig(
+        response_mime_type="application/json",
+        response_schema=_RESPONSE_SCHEMA,
+    ),
+)
+
+# Keep the connection to the generative service warm: a free count_tokens
+# call on the same client at start-up and then periodically, but only while
+# the assistant has been used recently, so the first command after a pause
+# doesn't pay for a new TLS/HTTP2 handshake
+KEEPALIVE_INTERVAL = 30  # seconds between pings
+KEEPALIVE_WINDOW = 600  # stop pinging this long after the last real request
+_last_used = time.monotonic()
+
+def _keepalive():
+    while True:
+        if time.monotonic() - _last_used < KEEPALIVE_WINDOW:
+            try:
+                _MODEL.count_tokens("ping")
+            except Exception:
+                pass  # best effort; the real request reconnects anyway
+        time.sleep(KEEPALIVE_INTERVAL)
+
+threading.Thread(target=_keepalive, name="gemini-keepalive", daemon=True).start()
+
+# Exact-match cache of interpreted commands: voice commands recur verbatim,
+# so repeats skip the network round-trip. Values are stored as JSON text so
+# every caller gets its own fresh dict.
+INTERPRET_CACHE_SIZE = 512
+INTERPRET_CACHE_TTL = 3600
+_interpret_cache = OrderedDict()  # normalized text -> (timestamp, json text)
+_interpret_cache_lock = threading.Lock()
+_in_flight = {}  # normalized text -> Future of the request already under way
+
+def _normalize(command_text):
+    return " ".join(command_text.lower().split())
+
+def clear_interpret_cache():
+    """Drop all cached interpretations (e.g. after changing the prompt)."""
+    with _interpret_cache_lock:
+        _interpret_cache.clear()
+
 def process_command_with_gemini(command_text):
-    """Sends the user's command to Gemini and returns a structured JSON object."""
-    model = genai.GenerativeModel('gemini-2.0-flash')
-    prompt = f"""
-    You are the intelligent core of a Windows desktop AI assistant.
-    Analyze the user's command and respond with a JSON object.
-    The JSON object must have "command" and "parameters" keys.
-
-    Available commands:
-    1. "open_app": {{"app_name": "name"}}
-    2. "search_web": {{"query": "term"}}
-    3. "search_youtube": {{"query": "term"}}
-    4. "play_video": {{"video_identifier": "partial title or position"}}
-    5. "send_email": {{"recipient": "person", "subject": "topic"}}
-    6. "exit": {{}} (Though this is handled by the GUI, it's good to have)
-    7. "unsupported": {{"reason": "explanation"}}
-
-    User's command: "{command_text}"
-    ---
-    Strictly output only the JSON object.
+    """Returns the structured JSON object for the command, cached by normalized text."""
+    key = _normalize(command_text)
+    now = time.monotonic()
+    with _interpret_cache_lock:
+        entry = _interpret_cache.get(key)
+        if entry is not None and now - entry[0] < INTERPRET_CACHE_TTL:
+            _interpret_cache.move_to_end(key)
+            return json.loads(entry[1])
+        # Callers asking for the same command while it is being interpreted
+        # share the one request instead of each sending their own
+        pending = _in_flight.get(key)
+        if pending is None:
+            pending = _in_flight[key] = Future()
+            owner = True
+        else:
+            owner = False
+
+    if not owner:
+        text = pending.result()
+        return json.loads(text) if text is not None else None
+
+    result = None
+    try:
+        result = _interpret_with_gemini(command_text)
+    finally:
+        text = json.dumps(result) if result is not None else None
+        with _interpret_cache_lock:
+            if text is not None:  # failures are retried next time, not cached
+                _interpret_cache[key] = (now, text)
+                _interpret_cache.move_to_end(key)
+                while len(_interpret_cache) > INTERPRET_CACHE_SIZE:
+                    _interpret_cache.popitem(last=False)
+            del _in_flight[key]
+        pending.set_result(text)
+    return result
+
+_DECODER = json.JSONDecoder()
+
+def _decode_object(text, start=None):
+    """Parse the JSON object starting at start (default: the first '{'), ignoring anything around it."""
+    if start is None:
+        start = text.find("{")
+        if start < 0:
+            raise ValueError("no JSON object in Gemini response")
+    return _DECODER.raw_decode(text, start)[0]
+
+class _ObjectEndFinder:
+    """
+    Tracks brace depth over text fed in pieces and reports where the first
+    top-level JSON object closes, skipping braces inside string literals.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.start = -1
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text):
+        """Append text; return the end index of the object once it has closed."""
+        self.buffer += text
+        buf = self.buffer
+        for i in range(self._pos, len(buf)):
+            ch = buf[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = self.start >= 0
+            elif ch == "{":
+                if self.start < 0:
+                    self.start = i
+                self._depth += 1
+            elif ch == "}" and self._depth:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._pos = i + 1
+                    return i + 1
+        self._pos = len(buf)
+        return None
+
+def _interpret_with_gemini(command_text):
+    """
+    Sends the user's command to Gemini and returns a structured JSON object.
+    The reply is streamed and parsed as soon as the outer object closes, so
+    any trailing tokens (closing fence, chatter) aren't waited for.
     """
+    global _last_used
+    _last_used = time.monotonic()
     try:
-        response = model.generate_content(prompt)
-        json_text = response.text.strip().replace("```json", "").replace("```", "")
-        return json.loads(json_text)
+        response = _MODEL.generate_content(f'User\'s command: "{command_text}"', stream=True)
+        finder = _ObjectEndFinder()
+        for chunk in response:
+            end = finder.feed(chunk.text)
+            if end is not None:
+                return _decode_object(finder.buffer, finder.start)
+        return _decode_object(finder.buffer)
     except Exception as e:
         print(f"Error processing command with Gemini: {e}")
         return None
@@ -3,79 +3,573 @@
 Speech Handler - Text-to-speech and speech recognition
 """
 
+import io
 import os
+import re
 import time
+import queue
+import random
+import base64
+import subprocess
+import hashlib
+import urllib.request
 import tempfile
 import threading
 import logging
-from typing import Optional
+import wave
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from typing import Dict, NamedTuple, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
 import speech_recognition as sr
-from gtts import gTTS
+from gtts import gTTS, gTTSError
 from playsound import playsound
 
+# Optional voice activity detection for trimming silence before upload
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+# Native-speed RMS trimming, used when webrtcvad isn't available
+try:
+    import numpy as np
+    from audio_fast import trim_and_downsample
+except ImportError:
+    np = None
+    trim_and_downsample = None
+
+# Optional in-memory playback (falls back to playsound if missing)
+try:
+    import sounddevice as sd
+    import miniaudio
+except ImportError:
+    sd = None
+    miniaudio = None
+
+from ui_emitter import CoalescingEmitter
+from audio_hub import HubMicrophone, get_audio_hub
+from config import (
+    SPEECH_RECOGNITION_TIMEOUT, TTS_ENGINE, PIPER_VOICE_PATH,
+    ASR_ENGINE, WHISPER_MODEL_SIZE, WHISPER_COMPUTE_TYPE
+)
+
 logger = logging.getLogger(__name__)
 
+# On-disk cache of synthesized speech, keyed by (backend, lang, slow, text)
+_TTS_CACHE_DIR = os.path.join(tempfile.gettempdir(), "nirvan_tts")
+_TTS_CACHE_MAX_FILES = 512
+os.makedirs(_TTS_CACHE_DIR, exist_ok=True)
+
+def _evict_tts_cache():
+    """Trim the TTS cache to its size bound, dropping least recently used files"""
+    try:
+        entries = [os.path.join(_TTS_CACHE_DIR, name) for name in os.listdir(_TTS_CACHE_DIR)]
+        if len(entries) <= _TTS_CACHE_MAX_FILES:
+            return
+        entries.sort(key=os.path.getatime)
+        for path in entries[:len(entries) - _TTS_CACHE_MAX_FILES]:
+            os.remove(path)
+    except OSError as e:
+        logger.warning(f"TTS cache eviction failed: {e}")
+
+_evict_tts_cache()
+
+# Keep-alive HTTP sessions for the Google speech endpoints, so each
+# recognition/synthesis request reuses an open TLS connection. requests
+# doesn't promise Session is thread-safe, so every worker thread (speech
+# worker, TTS prefetch pool, ASR workers) gets its own.
+_http_local = threading.local()
+
+def _http_session() -> requests.Session:
+    session = getattr(_http_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=2))
+        _http_local.session = session
+    return session
+
+# speech_recognition builds the request and parses the reply itself; only the
+# transport is ours. These helpers exist in SpeechRecognition 3.11-3.14; on
+# other versions recognition goes through the stock (one-shot) recognize_google.
+try:
+    from speech_recognition.recognizers import google as _sr_google
+    _sr_google.create_request_builder, _sr_google.OutputParser
+except (ImportError, AttributeError):
+    _sr_google = None
+
+def _recognize_google(audio: sr.AudioData, language: str = 'en-US', timeout: Optional[float] = None) -> str:
+    """Recognizer.recognize_google, posted over this thread's keep-alive session"""
+    if _sr_google is None:
+        recognizer = sr.Recognizer()
+        recognizer.operation_timeout = timeout
+        return recognizer.recognize_google(audio, language=language)
+    
+    request = _sr_google.create_request_builder(endpoint=_sr_google.ENDPOINT, language=language).build(audio)
+    try:
+        response = _http_session().post(
+            request.full_url, data=request.data, headers=dict(request.header_items()), timeout=timeout
+        )
+        response.raise_for_status()
+    except requests.HTTPError as e:
+        raise sr.RequestError(f"recognition request failed: {e}")
+    except requests.RequestException as e:
+        raise sr.RequestError(f"recognition connection failed: {e}")
+    return _sr_google.OutputParser(show_all=False, with_confidence=False).parse(response.text)
+
+class GoogleASRBackend:
+    """Google Web Speech API (network)"""
+    name = "google"
+    
+    def recognize(self, audio: sr.AudioData, timeout: Optional[float] = None) -> str:
+        return _recognize_google(audio, 'en-US', timeout)
+
+class WhisperASRBackend:
+    """Offline recognition with faster-whisper (CTranslate2, quantized on CPU)"""
+    name = "whisper"
+    
+    def __init__(self, model_size: str, compute_type: str = "int8"):
+        if np is None:
+            raise ImportError("numpy is required for whisper recognition")
+        from faster_whisper import WhisperModel
+        self._model = WhisperModel(model_size, device="cpu", compute_type=compute_type)
+        self._lock = threading.Lock()
+    
+    def recognize(self, audio: sr.AudioData, timeout: Optional[float] = None) -> str:
+        raw = audio.get_raw_data(convert_rate=16000, convert_width=2)
+        samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+        with self._lock:
+            segments, _ = self._model.transcribe(samples, language="en", beam_size=1, vad_filter=True)
+            text = " ".join(segment.text.strip() for segment in segments).strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+def _create_asr_backend(engine: str):
+    """Build the configured recognition backend, falling back to Google if it is unavailable"""
+    try:
+        if engine == "whisper":
+            return WhisperASRBackend(WHISPER_MODEL_SIZE, WHISPER_COMPUTE_TYPE)
+    except Exception as e:
+        logger.warning(f"ASR engine '{engine}' unavailable, falling back to Google: {e}")
+    return GoogleASRBackend()
+
+_VAD_RATE = 16000
+_VAD_FRAME_MS = 30
+_VAD_PADDING_FRAMES = 10  # keep ~300 ms either side of detected speech
+_VAD = webrtcvad.Vad(3) if webrtcvad else None
+
+def _trim_silence(audio: sr.AudioData, energy_threshold: float) -> sr.AudioData:
+    """Strip leading/trailing non-speech so less audio is uploaded for recognition"""
+    raw = audio.get_raw_data(convert_rate=_VAD_RATE, convert_width=2)
+    frame_bytes = _VAD_RATE * 2 * _VAD_FRAME_MS // 1000
+    
+    if _VAD is None:
+        if trim_and_downsample is None:
+            return audio
+        pcm = np.frombuffer(raw, dtype=np.int16)
+        pad_frames = _VAD_PADDING_FRAMES * _VAD_FRAME_MS // 10
+        trimmed = trim_and_downsample(pcm, _VAD_RATE, _VAD_RATE, energy_threshold, pad_frames)
+        if trimmed.size == 0:
+            return audio
+        return sr.AudioData(trimmed.tobytes(), _VAD_RATE, 2)
+    
+    n_frames = len(raw) // frame_bytes
+    voiced = [
+        i for i in range(n_frames)
+        if _VAD.is_speech(raw[i * frame_bytes:(i + 1) * frame_bytes], _VAD_RATE)
+    ]
+    if not voiced:
+        return audio
+    
+    start = max(0, voiced[0] - _VAD_PADDING_FRAMES)
+    end = min(n_frames, voiced[-1] + 1 + _VAD_PADDING_FRAMES)
+    return sr.AudioData(raw[start * frame_bytes:end * frame_bytes], _VAD_RATE, 2)
+
+_GTTS_AUDIO_RE = re.compile(r'jQ1olc","\[\\"(.*)\\"]')
+
+class _KeepAliveGTTS(gTTS):
+    """
+    gTTS whose requests go over this thread's keep-alive session instead of a
+    new session per call. Mirrors gTTS.stream() from gTTS 2.3-2.5; check it
+    again when upgrading gTTS.
+    """
+    
+    def stream(self):
+        prepare = getattr(self, "_prepare_requests", None)
+        if prepare is None:
+            yield from super().stream()
+            return
+        session = _http_session()
+        for pr in prepare():
+            try:
+                r = session.send(request=pr, proxies=urllib.request.getproxies(), timeout=self.timeout)
+                r.raise_for_status()
+            except requests.HTTPError:
+                raise gTTSError(tts=self, response=r)
+            except requests.RequestException:
+                raise gTTSError(tts=self)
+            
+            found = False
+            for line in r.iter_lines(chunk_size=1024):
+                audio_search = _GTTS_AUDIO_RE.search(line.decode("utf-8"))
+                if audio_search:
+                    found = True
+                    yield base64.b64decode(audio_search.group(1).encode("ascii"))
+            if not found:
+                # Fail loudly rather than write an empty file if the reply format moves
+                raise gTTSError(tts=self, response=r)
+
+class GTTSBackend:
+    """Google Translate TTS (network)"""
+    name = "gtts"
+    extension = ".mp3"
+    
+    def synthesize_bytes(self, text: str) -> bytes:
+        buf = io.BytesIO()
+        _KeepAliveGTTS(text=text, lang='en', slow=False).write_to_fp(buf)
+        return buf.getvalue()
+    
+    def synthesize(self, text: str, path: str):
+        with open(path, 'wb') as f:
+            f.write(self.synthesize_bytes(text))
+
+class Pyttsx3Backend:
+    """Offline TTS through the platform speech engine"""
+    name = "pyttsx3"
+    extension = ".wav"
+    
+    def __init__(self):
+        # The platform engines are thread-affine (SAPI5 is a COM object on
+        # Windows), so the engine is created on, and only ever driven from,
+        # one dedicated thread; callers on other threads hand work to it
+        self._thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pyttsx3")
+        self._engine = self._thread.submit(self._init_engine).result()
+    
+    @staticmethod
+    def _init_engine():
+        try:
+            import comtypes
+            comtypes.CoInitialize()
+        except ImportError:
+            pass  # not on Windows
+        import pyttsx3
+        return pyttsx3.init()
+    
+    def _run(self, text: str, path: str):
+        self._engine.save_to_file(text, path)
+        self._engine.runAndWait()
+    
+    def synthesize(self, text: str, path: str):
+        self._thread.submit(self._run, text, path).result()
+
+class PiperBackend:
+    """Offline neural TTS through the piper CLI"""
+    name = "piper"
+    extension = ".wav"
+    
+    def __init__(self, voice_path: str):
+        if not voice_path or not os.path.exists(voice_path):
+            raise FileNotFoundError(f"Piper voice model not found at '{voice_path}'")
+        self.voice_path = voice_path
+    
+    def synthesize(self, text: str, path: str):
+        proc = subprocess.Popen(
+            ["piper", "--model", self.voice_path, "--output_file", path],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+        _, err = proc.communicate(text.encode('utf-8'))
+        if proc.returncode != 0:
+            raise RuntimeError(f"piper exited with {proc.returncode}: {err.decode(errors='ignore').strip()}")
+
+def _create_tts_backend(engine: str):
+    """Build the configured TTS backend, falling back to gTTS if it is unavailable"""
+    try:
+        if engine == "pyttsx3":
+            return Pyttsx3Backend()
+        if engine == "piper":
+            return PiperBackend(PIPER_VOICE_PATH)
+    except Exception as e:
+        logger.warning(f"TTS engine '{engine}' unavailable, falling back to gTTS: {e}")
+    return GTTSBackend()
+
+def _tts_cache_path(text: str, backend, lang: str = 'en', slow: bool = False) -> str:
+    """Return the cache file path for an utterance"""
+    key = hashlib.sha1(f"{backend.name}|{lang}|{slow}|{text}".encode()).hexdigest()
+    return os.path.join(_TTS_CACHE_DIR, key + backend.extension)
+
+def _synthesize(text: str, backend) -> Tuple[str, Optional[bytes]]:
+    """
+    Synthesize text into the cache (if needed).
+    Returns the cached file path, plus the audio bytes when they were just
+    produced in memory so playback doesn't have to read the file back.
+    """
+    cached_path = _tts_cache_path(text, backend)
+    if os.path.exists(cached_path):
+        return cached_path, None
+    
+    # Per-thread partial file: a prefetch and the speech worker may race on the same text
+    root, ext = os.path.splitext(cached_path)
+    partial_path = f"{root}.{threading.get_ident()}.part{ext}"
+    data = None
+    if hasattr(backend, 'synthesize_bytes'):
+        data = backend.synthesize_bytes(text)
+        with open(partial_path, 'wb') as f:
+            f.write(data)
+    else:
+        backend.synthesize(text, partial_path)
+    os.replace(partial_path, cached_path)
+    return cached_path, data
+
+_WAV_DTYPES = {1: 'uint8', 2: 'int16', 4: 'int32'}
+
+class _Pcm(NamedTuple):
+    """Decoded audio, ready to hand to the output device"""
+    frames: bytes
+    samplerate: int
+    channels: int
+    dtype: str
+
+def _decode_audio(path: str, data: bytes) -> _Pcm:
+    """Decode synthesized WAV/MP3 bytes to raw PCM once, so replays skip decoding"""
+    if path.endswith(".wav"):
+        with wave.open(io.BytesIO(data), 'rb') as wf:
+            return _Pcm(wf.readframes(wf.getnframes()), wf.getframerate(),
+                        wf.getnchannels(), _WAV_DTYPES[wf.getsampwidth()])
+    info = miniaudio.mp3_get_info(data)
+    decoded = miniaudio.decode(
+        data,
+        output_format=miniaudio.SampleFormat.SIGNED16,
+        nchannels=info.nchannels,
+        sample_rate=info.sample_rate
+    )
+    return _Pcm(decoded.samples.tobytes(), decoded.sample_rate, decoded.nchannels, 'int16')
+
+def _play_pcm(pcm: _Pcm):
+    """Write decoded audio straight to the default output device and wait for it to finish"""
+    with sd.RawOutputStream(samplerate=pcm.samplerate,
+                            channels=pcm.channels,
+                            dtype=pcm.dtype) as stream:
+        stream.write(pcm.frames)
+
+# Long utterances are spoken sentence by sentence, synthesizing the next
+# sentence while the current one plays
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+_PIPELINE_MIN_CHARS = 120
+
+def _split_sentences(text: str):
+    """Sentence chunks for pipelined TTS; short text stays a single chunk"""
+    if len(text) < _PIPELINE_MIN_CHARS:
+        return [text]
+    return [part for part in _SENTENCE_SPLIT_RE.split(text.strip()) if part]
+
+# Decoded PCM kept in memory for the most recent utterances, so canned
+# phrases replay without touching the disk or decoding again
+_TTS_MEMORY_MAX = 32
+
+# Background synthesis, so network TTS overlaps with other waits (mic, Gemini)
+_TTS_PREFETCH_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts")
+
+# Recognition runs on a reused pool so each attempt can be bounded by a timeout
+_RECOGNITION_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="asr")
+
+# Retry schedule for transient recognition service errors
+_RECOGNITION_BACKOFF = [0.1, 0.3, 0.8]
+_RECOGNITION_RETRY_BUDGET = 1.5  # seconds
+
 class SpeechHandler:
     """Handles all speech input/output operations"""
     
     def __init__(self, socketio):
         self.socketio = socketio
+        self.emitter = CoalescingEmitter(socketio)
         self.recognizer = sr.Recognizer()
         
         # Configure recognizer
         self.recognizer.pause_threshold = 1.0
         self.recognizer.energy_threshold = 300
+        self.recognizer.dynamic_energy_threshold = True
+        
+        # Microphone backed by the shared audio hub stream (also feeding the
+        # wake word detector), calibrated once and then only periodically
+        self.microphone = HubMicrophone(get_audio_hub())
+        self._mic_lock = threading.Lock()
+        self._last_calibration = 0.0
+        self.calibration_interval = 300  # seconds
         
         # Timeouts
         self.listen_timeout = 10
         self.phrase_time_limit = 12
         
-        logger.info("Speech handler initialized")
+        # Text-to-speech engine
+        self.tts_backend = _create_tts_backend(TTS_ENGINE)
+        self._fallback_backend = GTTSBackend()
+        
+        # Speech recognition engine
+        self.asr_backend = _create_asr_backend(ASR_ENGINE)
+        
+        # text -> (cache path, decoded PCM or None without sounddevice), least recently used first
+        self._audio_cache = OrderedDict()
+        self._audio_cache_lock = threading.Lock()
+        
+        # In-flight prefetches by text, so speak() waits for one instead of duplicating it
+        self._prefetching: Dict[str, Future] = {}
+        self._prefetch_lock = threading.Lock()
+        
+        # Single speech worker so utterances never overlap on the audio device
+        self._speech_queue = queue.Queue()
+        self._speech_thread = threading.Thread(target=self._speech_worker, name="speech", daemon=True)
+        self._speech_thread.start()
+        
+        logger.info(f"Speech handler initialized (TTS: {self.tts_backend.name}, ASR: {self.asr_backend.name})")
     
-    def speak(self, text: str) -> bool:
-        """Convert text to speech and play it"""
+    def speak(self, text: str, wait: bool = True) -> bool:
+        """
+        Queue text for the speech worker and (by default) block until it has been played.
+        Utterances from any thread are played one at a time, in order.
+        """
         if not text or not text.strip():
             logger.warning("Empty text provided for speech")
             return False
         
         # Emit to UI
-        self.socketio.emit('display_message', {
+        self.emitter.emit_now('display_message', {
             'who': 'assistant',
             'message': text,
             'timestamp': time.time()
         })
         
+        done = threading.Event()
+        result = {'success': False}
+        self._speech_queue.put((text, done, result))
+        if not wait:
+            return True
+        done.wait()
+        return result['success']
+    
+    def prefetch(self, text: str) -> Future:
+        """
+        Synthesize text into the TTS caches in the background, so a later
+        speak() of the same text only has to play it
+        """
+        with self._prefetch_lock:
+            future = self._prefetching.get(text)
+            if future is None:
+                future = _TTS_PREFETCH_EXECUTOR.submit(self._load_audio, text)
+                self._prefetching[text] = future
+                future.add_done_callback(lambda _f: self._forget_prefetch(text, _f))
+        return future
+    
+    def _forget_prefetch(self, text: str, future: Future):
+        with self._prefetch_lock:
+            if self._prefetching.get(text) is future:
+                del self._prefetching[text]
+    
+    def _load_audio(self, text: str) -> Tuple[str, Optional[_Pcm]]:
+        """
+        Audio for text from memory, else from the disk cache or a fresh
+        synthesis (falling back to gTTS if the configured engine fails).
+        PCM is only decoded when sounddevice is available to play it.
+        """
+        with self._audio_cache_lock:
+            hit = self._audio_cache.get(text)
+            if hit is not None:
+                self._audio_cache.move_to_end(text)
+                return hit
+        
         try:
-            # Create TTS
-            tts = gTTS(text=text, lang='en', slow=False)
-            
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as tmp_file:
-                temp_path = tmp_file.name
-                tts.save(temp_path)
+            audio_path, audio_data = _synthesize(text, self.tts_backend)
+        except Exception as e:
+            if isinstance(self.tts_backend, GTTSBackend):
+                raise
+            logger.warning(f"{self.tts_backend.name} synthesis failed, using gTTS: {e}")
+            audio_path, audio_data = _synthesize(text, self._fallback_backend)
+        pcm = None
+        if sd is not None:
+            if audio_data is None:
+                with open(audio_path, 'rb') as f:
+                    audio_data = f.read()
+            try:
+                pcm = _decode_audio(audio_path, audio_data)
+            except Exception as e:
+                # e.g. pyttsx3's macOS driver writes AIFF whatever the file name;
+                # let playsound handle formats we can't decode
+                logger.debug(f"Could not decode {audio_path}, playing the file instead: {e}")
+        
+        with self._audio_cache_lock:
+            self._audio_cache[text] = (audio_path, pcm)
+            self._audio_cache.move_to_end(text)
+            while len(self._audio_cache) > _TTS_MEMORY_MAX:
+                self._audio_cache.popitem(last=False)
+        return audio_path, pcm
+    
+    def _speech_worker(self):
+        """Play queued utterances sequentially on a single long-lived thread"""
+        while True:
+            text, done, result = self._speech_queue.get()
+            try:
+                result['success'] = self._speak_now(text)
+            finally:
+                done.set()
+    
+    def _speak_now(self, text: str) -> bool:
+        """
+        Synthesize and play text on the calling thread. Multi-sentence text
+        is pipelined: every sentence is queued for background synthesis up
+        front, so each one after the first is usually ready when its turn comes.
+        """
+        sentences = _split_sentences(text)
+        if len(sentences) > 1:
+            for sentence in sentences:
+                self.prefetch(sentence)
+        
+        success = True
+        for sentence in sentences:
+            success = self._speak_chunk(sentence) and success
+        if success:
+            logger.info(f"Spoke: {text[:50]}...")
+        return success
+    
+    def _speak_chunk(self, text: str) -> bool:
+        """Synthesize (or wait for the prefetch of) one chunk and play it"""
+        with self._prefetch_lock:
+            pending = self._prefetching.get(text)
+        if pending is not None:
+            try:
+                pending.result()
+            except Exception:
+                pass  # synthesized (or retried with fallback) below
+        
+        try:
+            audio_path, pcm = self._load_audio(text)
             
             # Play audio
-            playsound(temp_path)
-            
-            # Cleanup
-            os.remove(temp_path)
-            
-            logger.info(f"Spoke: {text[:50]}...")
+            if pcm is not None:
+                _play_pcm(pcm)
+            else:
+                playsound(audio_path)
             return True
             
         except Exception as e:
             logger.error(f"Speech synthesis error: {e}")
             return False
     
+    def _calibrate_if_stale(self, source):
+        """Adjust for ambient noise on first use or once the calibration has aged out"""
+        if time.time() - self._last_calibration < self.calibration_interval:
+            return
+        logger.debug("Adjusting for ambient noise...")
+        self.recognizer.adjust_for_ambient_noise(source, duration=1)
+        self._last_calibration = time.time()
+    
     def listen_for_command(self) -> Optional[str]:
         """Listen for voice command and return recognized text"""
         try:
-            self.socketio.emit('listening_status', {'status': 'listening'})
-            
-            with sr.Microphone() as source:
-                # Adjust for ambient noise
-                logger.debug("Adjusting for ambient noise...")
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
+            with self._mic_lock, self.microphone as source:
+                self._calibrate_if_stale(source)
                 
                 # Listen for audio
                 logger.debug("Listening for command...")
@@ -86,12 +580,14 @@ class SpeechHandler:
                 )
             
             # Recognize speech
-            self.socketio.emit('listening_status', {'status': 'processing'})
-            command = self.recognizer.recognize_google(audio, language='en-US')
-            command = command.lower().strip()
+            audio = _trim_silence(audio, self.recognizer.energy_threshold)
+            command = self._recognize_with_retry(audio)
+            if not command:
+                return None
+            command = command.strip().lower()
             
             # Emit to UI
-            self.socketio.emit('display_message', {
+            self.emitter.emit_now('display_message', {
                 'who': 'user',
                 'message': command,
                 'timestamp': time.time()
@@ -109,21 +605,51 @@ class SpeechHandler:
         except sr.RequestError as e:
             logger.error(f"Speech recognition service error: {e}")
             return None
+        except FuturesTimeout:
+            logger.warning(f"Speech recognition timed out after {SPEECH_RECOGNITION_TIMEOUT}s")
+            return None
         except Exception as e:
             logger.error(f"Unexpected listen error: {e}")
             return None
-        finally:
-            self.socketio.emit('listening_status', {'status': 'idle'})
+    
+    def _sleep(self, seconds: float):
+        """Sleep that yields to Socket.IO's scheduler (green threads under eventlet/gevent)"""
+        if self.socketio is not None:
+            self.socketio.sleep(seconds)
+        else:
+            time.sleep(seconds)
+
+    def _recognize_with_retry(self, audio: sr.AudioData) -> str:
+        """
+        Recognize captured audio, retrying transient service errors on the same
+        audio with short jittered back-off inside a fixed time budget.
+        UnknownValueError is not retried; the user simply needs to speak again.
+        Each attempt is bounded by SPEECH_RECOGNITION_TIMEOUT.
+        """
+        budget_left = _RECOGNITION_RETRY_BUDGET
+        for attempt, backoff in enumerate(_RECOGNITION_BACKOFF + [None]):
+            future = _RECOGNITION_EXECUTOR.submit(
+                self.asr_backend.recognize, audio, SPEECH_RECOGNITION_TIMEOUT
+            )
+            try:
+                return future.result(timeout=SPEECH_RECOGNITION_TIMEOUT)
+            except sr.RequestError as e:
+                if backoff is None or budget_left <= 0:
+                    raise
+                delay = min(backoff, budget_left) + random.uniform(0, 0.05)
+                logger.warning(f"Recognition attempt {attempt + 1} failed ({e}), retrying in {delay:.2f}s")
+                self._sleep(delay)
+                budget_left -= delay
     
     def test_audio_system(self) -> bool:
         """Test if audio system is working"""
         try:
             # Test microphone
-            with sr.Microphone() as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
+            with self._mic_lock, self.microphone as source:
+                self._calibrate_if_stale(source)
             
-            # Test TTS
-            tts = gTTS(text="test", lang='en')
+            # Test the configured TTS engine (cached on disk after the first run)
+            _synthesize("test", self.tts_backend)
             
             logger.info("Audio system test: PASSED")
             return True
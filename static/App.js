@@ -30,6 +30,15 @@ const Message = ({ type, content, timestamp }) => (
     </div>
 );
 
+// Server AssistantState names -> StatusIndicator states
+const STATE_TO_UI = {
+    idle: 'waiting',
+    listening: 'listening',
+    thinking: 'thinking',
+    speaking: 'waiting',
+    error: 'waiting'
+};
+
 // Status Indicator Component
 const StatusIndicator = ({ state, onMicClick }) => {
     const renderMicButton = () => (
@@ -150,6 +159,18 @@ const App = () => {
                     }]);
                 });
 
+                // Events the server sent together in one frame
+                socketRef.current.on('bus', (events) => {
+                    events.forEach(({ event, data }) => {
+                        socketRef.current.listeners(event).forEach(handler => handler(data));
+                    });
+                });
+
+                // Assistant state from the server (already debounced there)
+                socketRef.current.on('state_change', (data) => {
+                    setUiState(STATE_TO_UI[data.state] || 'waiting');
+                });
+
                 socketRef.current.on('start_listening', () => {
                     setUiState('listening');
                 });
@@ -0,0 +1,109 @@
+"""
+UI Emitter - Rate-limited Socket.IO emits for high-frequency UI updates
+"""
+
+import time
+import queue
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _noop_emit(event, data=None, **kwargs):
+    return None
+
+class EmitBus:
+    """
+    Takes socket emits off the caller's thread. Events are queued and one
+    worker sends them in order; events that piled up while it was busy go
+    out together as a single 'bus' frame (a list of {event, data}) that the
+    client unpacks into the usual handlers.
+    """
+
+    def __init__(self, socketio):
+        self.socketio = socketio
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._worker, name="emit-bus", daemon=True)
+        self._thread.start()
+
+    def emit(self, event: str, data=None):
+        self._queue.put((event, data))
+
+    def _worker(self):
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                if len(batch) == 1:
+                    self.socketio.emit(*batch[0])
+                else:
+                    self.socketio.emit('bus', [{'event': event, 'data': data} for event, data in batch])
+            except Exception as e:
+                logger.error(f"Emit of {len(batch)} event(s) failed: {e}")
+
+_buses = {}
+_buses_lock = threading.Lock()
+
+def get_emit_bus(socketio) -> EmitBus:
+    """The one bus per Socket.IO server, so ordering holds across emitters"""
+    with _buses_lock:
+        bus = _buses.get(id(socketio))
+        if bus is None:
+            bus = _buses[id(socketio)] = EmitBus(socketio)
+        return bus
+
+class CoalescingEmitter:
+    """
+    Emits at most one event per name every `interval` seconds.
+    Updates arriving inside the window replace any pending payload for that
+    event and are flushed once the window closes, so the UI always ends up
+    with the latest value without being flooded by intermediate ones.
+    """
+
+    def __init__(self, socketio, interval: float = 0.05):
+        self.socketio = socketio
+        self.interval = interval
+
+        self._lock = threading.Lock()
+        self._last_sent = {}
+        self._pending = {}
+        self._timers = {}
+
+        # All sends go through the shared bus, so callers never wait on the
+        # socket; uncoalesced emits (events that must not be dropped) are bound
+        # straight to it
+        self._bus = get_emit_bus(socketio) if socketio is not None else None
+        self.emit_now = self._bus.emit if self._bus is not None else _noop_emit
+
+    def emit(self, event: str, data=None):
+        """Emit now if the event's window has passed, otherwise coalesce"""
+        with self._lock:
+            wait = self._last_sent.get(event, 0.0) + self.interval - time.monotonic()
+            if wait > 0:
+                self._pending[event] = data
+                if event not in self._timers:
+                    timer = threading.Timer(wait, self._flush, args=(event,))
+                    timer.daemon = True
+                    self._timers[event] = timer
+                    timer.start()
+                return
+            # Anything still pending is older than this update
+            self._pending.pop(event, None)
+            self._last_sent[event] = time.monotonic()
+        self._send(event, data)
+
+    def _flush(self, event: str):
+        with self._lock:
+            self._timers.pop(event, None)
+            if event not in self._pending:
+                return
+            data = self._pending.pop(event)
+            self._last_sent[event] = time.monotonic()
+        self._send(event, data)
+
+    def _send(self, event: str, data):
+        self.emit_now(event, data)
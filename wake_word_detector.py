@@ -3,31 +3,55 @@
 
 import os
 import pvporcupine
-import pyaudio
 import struct
+import time
+
+from audio_hub import get_audio_hub, SAMPLE_WIDTH
 
 PICOVOICE_ACCESS_KEY = ""
 WAKE_WORD_MODEL_PATH = "Nirvan_windows.ppn"
+_RESUBSCRIBE_DELAY = 1.0  # seconds between attempts to reopen the microphone
 
 def run_wake_word_detector(socketio_instance):
     """Listens for the wake word and emits a socket event to the frontend."""
-    porcupine, pa, audio_stream = None, None, None
+    porcupine, audio_stream = None, None
     try:
         if not os.path.exists(WAKE_WORD_MODEL_PATH):
             print(f"FATAL ERROR: Wake word model file not found at '{WAKE_WORD_MODEL_PATH}'")
             return
 
         porcupine = pvporcupine.create(access_key=PICOVOICE_ACCESS_KEY, keyword_paths=[WAKE_WORD_MODEL_PATH])
-        pa = pyaudio.PyAudio()
-        audio_stream = pa.open(
-            rate=porcupine.sample_rate, channels=1, format=pyaudio.paInt16,
-            input=True, frames_per_buffer=porcupine.frame_length
-        )
+        # Frames come from the shared microphone stream; command listening
+        # reads the same stream rather than opening the device again
+        hub = get_audio_hub()
+        if hub.sample_rate != porcupine.sample_rate:
+            print(f"FATAL ERROR: Microphone runs at {hub.sample_rate} Hz, wake word engine needs {porcupine.sample_rate} Hz")
+            return
+        audio_stream = hub.subscribe()
         print("Wake word engine running... Say 'Nirvan' to activate.")
         
+        # Format compiled once; porcupine copies the samples into a ctypes
+        # array, so a tuple of ints is the cheapest thing to hand it
+        frame_bytes = porcupine.frame_length * SAMPLE_WIDTH
+        unpack_frame = struct.Struct(f"<{porcupine.frame_length}h").unpack
+        
+        # Blocking read: the thread sleeps on the subscription queue until the
+        # hub's reader has delivered a full frame, so there is no polling
         while True:
-            pcm = audio_stream.read(porcupine.frame_length)
-            pcm = struct.unpack_from("h" * porcupine.frame_length, pcm)
+            try:
+                pcm = unpack_frame(audio_stream.read(frame_bytes))
+            except IOError as e:
+                # The hub's stream stalled or died; subscribing again reopens it
+                print(f"Wake word audio interrupted ({e}), reconnecting...")
+                audio_stream.close()
+                audio_stream = None
+                while audio_stream is None:
+                    time.sleep(_RESUBSCRIBE_DELAY)
+                    try:
+                        audio_stream = hub.subscribe()
+                    except Exception as e:
+                        print(f"Could not reopen the microphone: {e}")
+                continue
             
             if porcupine.process(pcm) >= 0:
                 print("Wake word 'Nirvan' detected!")
@@ -38,5 +62,4 @@ def run_wake_word_detector(socketio_instance):
         print(f"Error with wake word engine: {e}")
     finally:
         if audio_stream: audio_stream.close()
-        if pa: pa.terminate()
         if porcupine: porcupine.delete()